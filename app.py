@@ -17,6 +17,7 @@ import traceback as _tb
 from datetime import datetime, timedelta
 from utils.config import load_config, setup_logging
 from db.data_service import FinancialDataService
+from db.shared_cache import create_shared_backend, read_csv_shared
 from utils.advanced_charts import AdvancedCharts  # example_* removed (PRO charts replace them)
 # ML Service - optional, app works without it
 try:
@@ -205,7 +206,7 @@ def request_access():
 # Initialize data service
 # Connect to HANA database for production data
 try:
-    data_service = FinancialDataService(config)
+    data_service = FinancialDataService(config, hana_client=hana_client)
     if data_service.connect():
         logger.info("Data service initialized and connected to HANA")
     else:
@@ -215,20 +216,25 @@ except Exception as e:
     logger.warning(f"HANA data service not available: {e}. Will use CSV files for local testing.")
     data_service = None
 
+# Cross-worker store for CSV frames and model artifacts (None unless CACHE_SHARED_BACKEND is set)
+shared_cache = create_shared_backend(config.get('cache', {}))
+if ml_service is not None:
+    ml_service.shared_cache = shared_cache
+
 # Load CSV data (fallback for when HANA is unavailable)
 csv_data = None
 import os
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 try:
     basic_csv_path = os.path.join(APP_DIR, 'basic.csv')
-    financial_ratios_df = pd.read_csv(basic_csv_path)
+    financial_ratios_df = read_csv_shared(basic_csv_path, shared_cache)
     logger.info(f"Loaded basic.csv from {basic_csv_path}: {len(financial_ratios_df)} records")
     csv_data = {'financial_ratios': financial_ratios_df}
 
     # Load ANNUAL_FINANCIALS CSV (advance.csv)
     try:
         advance_csv_path = os.path.join(APP_DIR, 'advance.csv')
-        annual_financials_df = pd.read_csv(advance_csv_path)
+        annual_financials_df = read_csv_shared(advance_csv_path, shared_cache)
         logger.info(f"Loaded advance.csv from {advance_csv_path}: {len(annual_financials_df)} records")
         csv_data['annual_financials'] = annual_financials_df
     except Exception as e:
@@ -8,6 +8,7 @@ for development, testing, and demonstration purposes.
 Usage:
     python acdoca_generator.py --months 24 --output data/acdoca_sample.csv
     python acdoca_generator.py --load-hana  # Generate and load directly to HANA
+    python acdoca_generator.py --load-hana --workers 3 --batch-size 10000
 """
 
 import os
@@ -16,6 +17,8 @@ import json
 import random
 import argparse
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 import pandas as pd
@@ -596,12 +599,127 @@ class ACDOCAGenerator:
         }
 
 
+# ============================================================================
+# HANA LOADER
+# ============================================================================
+
+# Generated frame -> target table
+HANA_TABLES = {
+    'acdoca': 'ACDOCA_SAMPLE',
+    'budget': 'ACDOCA_BUDGET',
+    'fx_rates': 'FX_RATES',
+}
+
+
+def ensure_acdoca_tables(client, schema):
+    """
+    Create the ACDOCA tables and indexes from db/acdoca_schema.sql if missing.
+
+    Args:
+        client: Connected HanaClient
+        schema: Target schema
+    """
+    schema_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'db', 'acdoca_schema.sql')
+    with open(schema_path) as f:
+        sql_text = f.read()
+
+    client.create_schema_if_not_exists(schema)
+
+    cursor = client.connection.cursor()
+    created = set()
+    for statement in sql_text.split(';'):
+        lines = [line for line in statement.splitlines() if not line.strip().startswith('--')]
+        statement = '\n'.join(lines).strip().format(schema=schema)
+        if not statement:
+            continue
+
+        if statement.upper().startswith('CREATE TABLE'):
+            table = statement.split('"."', 1)[1].split('"', 1)[0]
+            if client.table_exists(schema, table):
+                continue
+            cursor.execute(statement)
+            client.invalidate_table_metadata(schema, table)
+            created.add(table)
+            logger.info(f"Created table {schema}.{table}")
+        elif statement.upper().startswith('CREATE INDEX'):
+            # Indexes only accompany tables created in this run
+            index_table = statement.rsplit('"."', 1)[1].split('"', 1)[0]
+            if index_table in created:
+                cursor.execute(statement)
+    cursor.close()
+
+
+def load_to_hana(client, data, schema, batch_size=5000, workers=1):
+    """
+    Bulk-load generated frames into HANA.
+
+    Each frame is split per company code (RBUKRS) and the parts are loaded
+    concurrently on separate pooled connections when workers > 1. Rows are
+    sent as executemany array binds of batch_size rows.
+
+    Args:
+        client: Connected HanaClient
+        data: Dict of frames returned by ACDOCAGenerator.generate_all()
+        schema: Target schema
+        batch_size: Rows per executemany round trip
+        workers: Number of parallel loader connections
+
+    Returns:
+        Dict of table name -> {'rows', 'seconds', 'rows_per_sec'}
+    """
+    results = {}
+
+    for key, table in HANA_TABLES.items():
+        df = data.get(key)
+        if df is None or df.empty:
+            continue
+
+        if workers > 1 and 'RBUKRS' in df.columns:
+            parts = [part for _, part in df.groupby('RBUKRS', sort=False)]
+        else:
+            parts = [df]
+
+        start = time.perf_counter()
+        rows_loaded = 0
+
+        def load_part(part):
+            with client.pooled_connection() as connection:
+                return client.load_frame(part, schema, table, batch_size=batch_size,
+                                         connection=connection)
+
+        if len(parts) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(load_part, part) for part in parts]
+                for future in as_completed(futures):
+                    rows_loaded += future.result()
+        else:
+            rows_loaded = client.load_frame(df, schema, table, batch_size=batch_size)
+
+        seconds = time.perf_counter() - start
+        rows_per_sec = rows_loaded / seconds if seconds > 0 else 0
+        results[table] = {
+            'rows': rows_loaded,
+            'seconds': round(seconds, 2),
+            'rows_per_sec': round(rows_per_sec, 1),
+        }
+
+        if rows_loaded < len(df):
+            logger.warning(f"{table}: loaded {rows_loaded:,} of {len(df):,} rows")
+        logger.info(f"{table}: {rows_loaded:,} rows in {seconds:.1f}s ({rows_per_sec:,.0f} rows/sec)")
+
+    return results
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Generate ACDOCA sample data')
     parser.add_argument('--months', type=int, default=24, help='Number of months to generate')
     parser.add_argument('--output', type=str, default='data/acdoca_sample.csv', help='Output CSV path')
     parser.add_argument('--load-hana', action='store_true', help='Load directly to HANA')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Rows per HANA insert batch')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parallel HANA connections (one load per company code)')
     args = parser.parse_args()
     
     # Initialize generator
@@ -636,16 +754,21 @@ def main():
             
             config = load_config()
             client = HanaClient(config)
+            # One pooled connection per parallel loader
+            client.pool_max_size = max(client.pool_max_size, args.workers)
             
             if client.connect():
                 schema = config['hana']['schema']
+                ensure_acdoca_tables(client, schema)
                 
-                # Load ACDOCA
                 logger.info(f"Loading {len(data['acdoca'])} ACDOCA records to HANA...")
-                # Implementation would go here
+                results = load_to_hana(client, data, schema,
+                                       batch_size=args.batch_size, workers=args.workers)
                 
                 client.close()
-                logger.info("HANA load complete")
+                total_rows = sum(r['rows'] for r in results.values())
+                total_seconds = sum(r['seconds'] for r in results.values())
+                logger.info(f"HANA load complete: {total_rows:,} rows in {total_seconds:.1f}s")
             else:
                 logger.error("Failed to connect to HANA")
         except Exception as e:
@@ -43,6 +43,7 @@ class AuthService:
             self.logger.error("No connection to HANA. Cannot create user.")
             return False
 
+        cursor = None
         try:
             # Check if user already exists
             if self.user_exists(email):
@@ -52,7 +53,7 @@ class AuthService:
             # Encrypt the password
             encrypted_password = encrypt_password(password)
 
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             insert_sql = f"""
             INSERT INTO "{self.schema}"."{self.table_name}" (
@@ -61,8 +62,7 @@ class AuthService:
             """
 
             cursor.execute(insert_sql, [email, encrypted_password, full_name, role])
-            self.hana_client.connection.commit()
-            cursor.close()
+            cursor.connection.commit()
 
             self.logger.info(f"User created successfully: {email}")
             return True
@@ -70,6 +70,9 @@ class AuthService:
         except Exception as e:
             self.logger.error(f"Error creating user: {str(e)}")
             return False
+        finally:
+            if cursor:
+                cursor.close()
 
     def authenticate(self, email, password, ip_address=None):
         """
@@ -87,8 +90,9 @@ class AuthService:
             self.logger.error("No connection to HANA. Cannot authenticate.")
             return None
 
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             # Get user from database
             query = f"""
@@ -132,7 +136,7 @@ class AuthService:
                 WHERE "EMAIL" = ?
                 """
                 cursor.execute(update_sql, [datetime.now(), email])
-                self.hana_client.connection.commit()
+                cursor.connection.commit()
                 cursor.close()
 
                 self.logger.info(f"Successful login for user: {email}")
@@ -151,7 +155,7 @@ class AuthService:
                 WHERE "EMAIL" = ?
                 """
                 cursor.execute(update_sql, [new_attempts, email])
-                self.hana_client.connection.commit()
+                cursor.connection.commit()
                 cursor.close()
 
                 self.logger.warning(f"Failed login attempt for user: {email} (attempt {new_attempts})")
@@ -169,6 +173,9 @@ class AuthService:
         except Exception as e:
             self.logger.error(f"Error during authentication: {str(e)}")
             return None
+        finally:
+            if cursor:
+                cursor.close()
 
     def user_exists(self, email):
         """
@@ -183,8 +190,9 @@ class AuthService:
         if not self.hana_client.connection:
             return False
 
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             query = f"""
             SELECT COUNT(*) FROM "{self.schema}"."{self.table_name}"
@@ -193,13 +201,15 @@ class AuthService:
 
             cursor.execute(query, [email])
             count = cursor.fetchone()[0]
-            cursor.close()
 
             return count > 0
 
         except Exception as e:
             self.logger.error(f"Error checking user existence: {str(e)}")
             return False
+        finally:
+            if cursor:
+                cursor.close()
 
     def get_user_info(self, email):
         """
@@ -214,8 +224,9 @@ class AuthService:
         if not self.hana_client.connection:
             return None
 
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             query = f"""
             SELECT "ID", "EMAIL", "FULL_NAME", "ROLE", "IS_ACTIVE",
@@ -226,7 +237,6 @@ class AuthService:
 
             cursor.execute(query, [email])
             row = cursor.fetchone()
-            cursor.close()
 
             if row:
                 return {
@@ -244,6 +254,9 @@ class AuthService:
         except Exception as e:
             self.logger.error(f"Error getting user info: {str(e)}")
             return None
+        finally:
+            if cursor:
+                cursor.close()
 
     def list_all_users(self):
         """
@@ -255,8 +268,9 @@ class AuthService:
         if not self.hana_client.connection:
             return []
 
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             query = f"""
             SELECT "ID", "EMAIL", "FULL_NAME", "ROLE", "IS_ACTIVE",
@@ -267,7 +281,6 @@ class AuthService:
 
             cursor.execute(query)
             rows = cursor.fetchall()
-            cursor.close()
 
             users = []
             for row in rows:
@@ -286,3 +299,6 @@ class AuthService:
         except Exception as e:
             self.logger.error(f"Error listing users: {str(e)}")
             return []
+        finally:
+            if cursor:
+                cursor.close()
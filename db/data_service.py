@@ -5,52 +5,195 @@ Provides clean interface for dashboard queries
 
 import logging
 import pandas as pd
-from datetime import datetime, timedelta
 from db.hana_client import HanaClient
+from db.result_decoder import fetch_frame
+from db.sql_filters import InListBinder
+from db.result_cache import ResultCache
+from db.shared_cache import create_shared_backend
+from utils.acdoca_analytics import ACDOCAAnalytics, AcdocaAggregates
+from utils.acdoca_frame import AcdocaDictionaries, CompactAcdocaFrame, TEXT_COLUMNS
+
+
+def _keyset_predicate(keys, values):
+    """
+    Build the seek predicate selecting rows after a given sort key.
+
+    Args:
+        keys (tuple): (column, 'ASC' or 'DESC') pairs of the ORDER BY
+        values (list): Sort key of the last row already read
+
+    Returns:
+        tuple: (SQL predicate, parameter list)
+    """
+    (column, direction), rest = keys[0], keys[1:]
+    operator = '<' if direction == 'DESC' else '>'
+    if not rest:
+        return f'"{column}" {operator} ?', [values[0]]
+    inner, inner_params = _keyset_predicate(rest, values[1:])
+    return (f'("{column}" {operator} ? OR ("{column}" = ? AND {inner}))',
+            [values[0], values[0]] + inner_params)
+
+
+def _bind_value(value):
+    """Convert a pandas/numpy scalar read back from a frame into a driver parameter"""
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
 
 
 class FinancialDataService:
     """Service for retrieving and processing financial data for dashboard"""
 
-    def __init__(self, config):
-        """Initialize data service with HANA client"""
+    # Seconds each query's result stays cached when no ingestion watermark is used
+    # (overridable via config['cache']['ttls'])
+    CACHE_TTLS = {
+        'financial_ratios': 60,
+        'advanced_financials': 300,
+        'annual_financials': 900,
+        'dashboard_stats': 60,
+        'acdoca_dictionaries': 900,
+    }
+
+    # Sort key of iter_acdoca_data: get_acdoca_data's order, made unique by
+    # company code and fiscal year (BELNR numbering restarts per company and year)
+    ACDOCA_KEYSET = (
+        ('BUDAT', 'DESC'),
+        ('BELNR', 'ASC'),
+        ('DOCLN', 'ASC'),
+        ('RBUKRS', 'ASC'),
+        ('GJAHR', 'ASC'),
+    )
+
+    # Columns returned by get_acdoca_data
+    ACDOCA_COLUMNS = (
+        'RBUKRS', 'GJAHR', 'BELNR', 'DOCLN',
+        'BLDAT', 'BUDAT',
+        'RACCT', 'RCNTR', 'PRCTR', 'SEGMENT',
+        'HSL', 'RHCUR', 'KSL', 'RKCUR',
+        'POPER', 'DRCRK', 'BLART',
+        'SGTXT', 'BKTXT',
+    )
+
+    def __init__(self, config, hana_client=None):
+        """
+        Initialize data service with HANA client
+
+        Args:
+            config (dict): Configuration parameters
+            hana_client (HanaClient): Optional client whose connection pool is
+                shared with the auth and ML services
+        """
         self.logger = logging.getLogger(__name__)
-        self.hana_client = HanaClient(config)
+        self._owns_client = hana_client is None
+        self.hana_client = hana_client or HanaClient(config)
         self.schema = config['hana']['schema']
         self.connected = False
 
-        # Simple in-memory cache with TTL
-        self._cache = {}
-        self._cache_ttl = timedelta(minutes=1)  # Cache for 1 minute
+        # Bounded LRU cache shared by the request threads of this worker. Entries
+        # live until the ingestion watermark moves (max_age is only a safety net);
+        # with watermarks disabled the per-query TTLs apply instead
+        cache_config = config.get('cache', {})
+        self.use_watermark = cache_config.get('use_watermark', True)
+        self._cache = ResultCache(
+            max_entries=cache_config.get('max_entries', 256),
+            max_bytes=cache_config.get('max_mb', 64) * 1024 * 1024,
+            default_ttl=cache_config.get('max_age', 3600) if self.use_watermark
+            else cache_config.get('default_ttl', 60),
+            watermark_fn=self.hana_client.get_ingestion_watermark if self.use_watermark else None,
+            watermark_interval=cache_config.get('watermark_interval', 5),
+            max_stale=cache_config.get('max_stale', 300),
+            refresh_ahead=cache_config.get('refresh_ahead', 0.2),
+            hot_threshold=cache_config.get('hot_threshold', 3),
+            shared=create_shared_backend(cache_config)
+        )
+        self.cache_ttls = {**self.CACHE_TTLS, **cache_config.get('ttls', {})}
+        self.hana_client.add_ingestion_listener(self._on_ingestion)
+
+        # (master values, AcdocaDictionaries built from them) shared by compact frames
+        self._acdoca_dictionaries = None
 
     def connect(self):
-        """Establish connection to HANA"""
-        self.connected = self.hana_client.connect()
+        """Establish connection to HANA (reuses an already connected shared client)"""
+        if self.hana_client.connection is not None:
+            self.connected = True
+        else:
+            self.connected = self.hana_client.connect()
         return self.connected
 
     def close(self):
-        """Close HANA connection"""
-        if self.hana_client:
+        """Close HANA connection (a shared client is left to its owner)"""
+        self._cache.close()
+        if self.hana_client and self._owns_client:
             self.hana_client.close()
-            self.connected = False
-
-    def _get_cached(self, key):
-        """Get data from cache if not expired"""
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if datetime.now() - timestamp < self._cache_ttl:
-                self.logger.debug(f"Cache hit for key: {key}")
-                return data
-            else:
-                # Cache expired, remove it
-                del self._cache[key]
-                self.logger.debug(f"Cache expired for key: {key}")
-        return None
+        self.connected = False
+
+    def _cached_query(self, key, method, loader, default=pd.DataFrame):
+        """
+        Return a query result through the result cache.
+
+        Args:
+            key (str): Cache key
+            method (str): Query name selecting the TTL when watermarks are disabled
+            loader (callable): Runs the query; returns None on error
+            default (callable): Builds the result returned on error
 
-    def _set_cached(self, key, data):
-        """Store data in cache with timestamp"""
-        self._cache[key] = (data, datetime.now())
-        self.logger.debug(f"Cache set for key: {key}")
+        Returns:
+            Cached or freshly loaded result (default() on error)
+        """
+        ttl = None if self.use_watermark else self.cache_ttls.get(method)
+        result = self._cache.get_or_load(key, loader, ttl=ttl)
+        return result if result is not None else default()
+
+    def _cached_per_ticker(self, method, tickers, loader):
+        """
+        Return a multi-ticker query result composed from per-ticker cache entries.
+
+        Each ticker's rows are cached on their own, so the order of the list
+        does not matter and adding a ticker to a cached selection queries only
+        that ticker. All missing tickers are loaded with one query.
+
+        Args:
+            method (str): Query name, used as cache key prefix and TTL selector
+            tickers (list): Tickers to return
+            loader (callable): Takes a list of tickers and returns their rows
+                ordered by ticker (None on error)
+
+        Returns:
+            pd.DataFrame: Rows of the tickers ordered by ticker; tickers that
+                could not be loaded are left out (empty when none could)
+        """
+        tickers = sorted(set(tickers))
+        keys = {f"{method}:{ticker}": ticker for ticker in tickers}
+
+        def load_missing(missing_keys):
+            df = loader([keys[key] for key in missing_keys])
+            if df is None:
+                return None
+            # Tickers without rows cache an empty frame, so they are not queried again
+            groups = dict(tuple(df.groupby('TICKER', sort=False))) if not df.empty else {}
+            return {key: groups.get(keys[key], df.iloc[0:0]) for key in missing_keys}
+
+        ttl = None if self.use_watermark else self.cache_ttls.get(method)
+        frames = self._cache.get_or_load_many(list(keys), load_missing, ttl=ttl)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat([frames[key] for key in keys if key in frames], ignore_index=True)
+
+    def _on_ingestion(self, run_id):
+        """Drop cached results when an ingestion run in this process lands"""
+        self._cache.invalidate()
+        self.logger.info(f"Result cache invalidated after ingestion run {run_id}")
+
+    def get_cache_stats(self):
+        """
+        Get result cache statistics.
+
+        Returns:
+            dict: hits, misses, expirations, evictions, hit_rate, entries and bytes
+        """
+        return self._cache.get_stats()
 
     def get_financial_ratios(self, limit=50):
         """
@@ -66,12 +209,13 @@ class FinancialDataService:
             self.logger.error("Not connected to HANA")
             return pd.DataFrame()
 
-        # Check cache first
+        # Served from the result cache, refreshed in the background when stale
         cache_key = f"financial_ratios_{limit}"
-        cached_data = self._get_cached(cache_key)
-        if cached_data is not None:
-            return cached_data
+        return self._cached_query(
+            cache_key, 'financial_ratios', lambda: self._load_financial_ratios(limit))
 
+    def _load_financial_ratios(self, limit):
+        """Query the latest FINANCIAL_RATIOS rows (None on error, so failures are not cached)"""
         cursor = None
         try:
             query = f"""
@@ -97,33 +241,17 @@ class FinancialDataService:
             LIMIT {limit}
             """
 
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             cursor.execute(query)
 
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-
-            df = pd.DataFrame(data, columns=columns)
+            df = fetch_frame(cursor)
             self.logger.info(f"Retrieved {len(df)} financial ratio records")
 
-            # HANA returns decimal.Decimal — convert numeric columns to float
-            skip_cols = {'TICKER', 'IDENTIFIER_TYPE', 'IDENTIFIER_VALUE',
-                         'ID_BB_GLOBAL', 'DATA_DATE', 'INSERTED_AT'}
-            for col in df.columns:
-                if col not in skip_cols:
-                    try:
-                        df[col] = pd.to_numeric(df[col])
-                    except (ValueError, TypeError):
-                        pass
-
-            # Cache the result
-            self._set_cached(cache_key, df)
-
             return df
 
         except Exception as e:
             self.logger.error(f"Error retrieving financial ratios: {str(e)}")
-            return pd.DataFrame()
+            return None
         finally:
             if cursor:
                 cursor.close()
@@ -143,24 +271,40 @@ class FinancialDataService:
             self.logger.error("Not connected to HANA")
             return pd.DataFrame()
 
-        cache_key = f"advanced_financials_{','.join(tickers) if tickers else 'all'}_{limit}"
-        cached_data = self._get_cached(cache_key)
-        if cached_data is not None:
-            return cached_data
+        if tickers:
+            # Each ticker keeps its latest `limit` rows; the first `limit` rows in
+            # ticker order are what a single query with LIMIT would return
+            df = self._cached_per_ticker(
+                f'advanced_financials_{limit}', tickers,
+                lambda missing: self._load_advanced_financials(missing, limit))
+            return df.head(limit)
 
+        return self._cached_query(
+            f"advanced_financials_all_{limit}", 'advanced_financials',
+            lambda: self._load_advanced_financials(None, limit))
+
+    def _load_advanced_financials(self, tickers, limit):
+        """Query FINANCIAL_DATA_ADVANCED (None on error, so failures are not cached)"""
         cursor = None
+        in_list = None
         try:
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
             if tickers:
-                placeholders = ', '.join(['?' for _ in tickers])
+                # Latest `limit` rows of each ticker, so results can be cached per ticker
+                ticker_filter, params = in_list('"TICKER"', tickers)
                 query = f"""
-                SELECT *
-                FROM "{self.schema}"."FINANCIAL_DATA_ADVANCED"
-                WHERE "TICKER" IN ({placeholders})
+                SELECT * FROM (
+                    SELECT A.*, ROW_NUMBER() OVER (
+                        PARTITION BY "TICKER" ORDER BY "INSERTED_AT" DESC
+                    ) AS "TICKER_ROW_NUM"
+                    FROM "{self.schema}"."FINANCIAL_DATA_ADVANCED" A
+                    WHERE {ticker_filter}
+                )
+                WHERE "TICKER_ROW_NUM" <= {limit}
                 ORDER BY "TICKER", "INSERTED_AT" DESC
-                LIMIT {limit}
                 """
-                cursor = self.hana_client.connection.cursor()
-                cursor.execute(query, tickers)
+                cursor.execute(query, params)
             else:
                 query = f"""
                 SELECT *
@@ -168,34 +312,21 @@ class FinancialDataService:
                 ORDER BY "INSERTED_AT" DESC
                 LIMIT {limit}
                 """
-                cursor = self.hana_client.connection.cursor()
                 cursor.execute(query)
 
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-
-            df = pd.DataFrame(data, columns=columns)
+            df = fetch_frame(cursor)
+            if 'TICKER_ROW_NUM' in df.columns:
+                df = df.drop(columns='TICKER_ROW_NUM')
             self.logger.info(f"Retrieved {len(df)} advanced financial records")
 
-            # HANA returns decimal.Decimal — convert numeric columns to float
-            skip_cols = {'TICKER', 'IDENTIFIER_TYPE', 'IDENTIFIER_VALUE',
-                         'ID_BB_COMPANY', 'ID_BB_GLOBAL', 'ID_BB_GLOBAL_COMPANY',
-                         'FISCAL_YEAR_PERIOD', 'ACCOUNTING_STANDARD',
-                         'DATA_DATE', 'INSERTED_AT'}
-            for col in df.columns:
-                if col not in skip_cols:
-                    try:
-                        df[col] = pd.to_numeric(df[col])
-                    except (ValueError, TypeError):
-                        pass
-
-            self._set_cached(cache_key, df)
             return df
 
         except Exception as e:
             self.logger.error(f"Error retrieving advanced financials: {str(e)}")
-            return pd.DataFrame()
+            return None
         finally:
+            if in_list:
+                in_list.close()
             if cursor:
                 cursor.close()
 
@@ -218,7 +349,7 @@ class FinancialDataService:
             ORDER BY "TICKER"
             """
 
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             cursor.execute(query)
             tickers = [row[0] for row in cursor.fetchall()]
 
@@ -246,7 +377,7 @@ class FinancialDataService:
 
         cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             # Get ratios data
             ratios_query = f"""
@@ -255,8 +386,7 @@ class FinancialDataService:
             ORDER BY "INSERTED_AT" DESC
             """
             cursor.execute(ratios_query, [ticker])
-            columns = [desc[0] for desc in cursor.description]
-            ratios_df = pd.DataFrame(cursor.fetchall(), columns=columns)
+            ratios_df = fetch_frame(cursor)
 
             # Get advanced data
             advanced_query = f"""
@@ -265,8 +395,7 @@ class FinancialDataService:
             ORDER BY "INSERTED_AT" DESC
             """
             cursor.execute(advanced_query, [ticker])
-            columns = [desc[0] for desc in cursor.description]
-            advanced_df = pd.DataFrame(cursor.fetchall(), columns=columns)
+            advanced_df = fetch_frame(cursor)
 
             return {
                 'ratios': ratios_df,
@@ -292,7 +421,7 @@ class FinancialDataService:
 
         cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             # Count records in FINANCIAL_RATIOS table
             cursor.execute(f'SELECT COUNT(*) FROM "{self.schema}"."FINANCIAL_RATIOS"')
@@ -328,6 +457,9 @@ class FinancialDataService:
         """
         Get comprehensive dashboard statistics for sidebar display
 
+        All figures come from one statement and are cached until the ingestion
+        watermark moves, so a sidebar refresh normally costs no HANA scan.
+
         Returns:
             dict: Dashboard statistics including counts, data quality, timestamps
         """
@@ -341,68 +473,62 @@ class FinancialDataService:
                 'connection_status': 'Disconnected'
             }
 
+        stats = self._cached_query('dashboard_stats', 'dashboard_stats', self._load_dashboard_stats,
+                                   default=lambda: None)
+        if stats is None:
+            return {
+                'total_records': 0,
+                'annual_records': 0,
+                'unique_tickers': 0,
+                'last_sync': None,
+                'data_quality': 0.0,
+                'connection_status': 'Error'
+            }
+        return dict(stats)
+
+    def _load_dashboard_stats(self):
+        """Query the sidebar statistics in one round trip (None on error, so failures are not cached)"""
         cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
-            # Count records in FINANCIAL_RATIOS table
-            cursor.execute(f'SELECT COUNT(*) FROM "{self.schema}"."FINANCIAL_RATIOS"')
-            ratios_count = cursor.fetchone()[0]
-
-            # Count records in ANNUAL_FINANCIALS_10K table
-            try:
-                cursor.execute(f'SELECT COUNT(*) FROM "{self.schema}"."ANNUAL_FINANCIALS_10K"')
-                annual_count = cursor.fetchone()[0]
-            except Exception:
-                annual_count = 0
-
-            # Get unique tickers
-            cursor.execute(f'SELECT COUNT(DISTINCT "TICKER") FROM "{self.schema}"."FINANCIAL_RATIOS"')
-            unique_tickers = cursor.fetchone()[0]
-
-            # Get last update time (most recent insert)
-            cursor.execute(f'SELECT MAX("INSERTED_AT") FROM "{self.schema}"."FINANCIAL_RATIOS"')
-            last_sync = cursor.fetchone()[0]
-
-            # Calculate data quality (percentage of non-null values in key columns)
+            # One scan of FINANCIAL_RATIOS for the exact figures; the annual row
+            # count comes from table metadata instead of a second COUNT(*)
             cursor.execute(f'''
                 SELECT
                     COUNT(*) as total,
+                    COUNT(DISTINCT "TICKER") as unique_tickers,
+                    MAX("INSERTED_AT") as last_sync,
                     COUNT("TICKER") as ticker_count,
                     COUNT("GROSS_MARGIN") as gross_margin_count,
                     COUNT("EBITDA_MARGIN") as ebitda_margin_count,
                     COUNT("CUR_RATIO") as cur_ratio_count,
-                    COUNT("QUICK_RATIO") as quick_ratio_count
+                    COUNT("QUICK_RATIO") as quick_ratio_count,
+                    (SELECT SUM("RECORD_COUNT") FROM "SYS"."M_TABLES"
+                     WHERE "SCHEMA_NAME" = ? AND "TABLE_NAME" = 'ANNUAL_FINANCIALS_10K') as annual_count
                 FROM "{self.schema}"."FINANCIAL_RATIOS"
-            ''')
-            quality_row = cursor.fetchone()
-            if quality_row and quality_row[0] > 0:
-                total = quality_row[0]
-                filled_count = sum(quality_row[1:])
-                total_possible = total * 5  # 5 key columns
-                data_quality = (filled_count / total_possible) * 100 if total_possible > 0 else 0
+            ''', [self.schema])
+            row = cursor.fetchone()
+
+            ratios_count = row[0] if row else 0
+            if ratios_count:
+                # Percentage of non-null values in the 5 key columns
+                data_quality = sum(row[3:8]) / (ratios_count * 5) * 100
             else:
                 data_quality = 0.0
 
             return {
                 'total_records': ratios_count,
-                'annual_records': annual_count,
-                'unique_tickers': unique_tickers,
-                'last_sync': last_sync,
+                'annual_records': int(row[8] or 0) if row else 0,
+                'unique_tickers': row[1] if row else 0,
+                'last_sync': row[2] if row else None,
                 'data_quality': round(data_quality, 1),
                 'connection_status': 'Connected'
             }
 
         except Exception as e:
             self.logger.error(f"Error retrieving dashboard stats: {str(e)}")
-            return {
-                'total_records': 0,
-                'annual_records': 0,
-                'unique_tickers': 0,
-                'last_sync': None,
-                'data_quality': 0.0,
-                'connection_status': 'Error'
-            }
+            return None
         finally:
             if cursor:
                 cursor.close()
@@ -422,32 +548,37 @@ class FinancialDataService:
             self.logger.error("Not connected to HANA")
             return pd.DataFrame()
 
-        # Check cache first
-        cache_key = f"annual_financials_{','.join(tickers) if tickers else 'all'}"
-        cached_data = self._get_cached(cache_key)
-        if cached_data is not None:
-            return cached_data
+        # Served from the result cache, refreshed in the background when stale
+        if tickers:
+            return self._cached_per_ticker('annual_financials', tickers, self._load_annual_financials)
 
+        return self._cached_query(
+            "annual_financials_all", 'annual_financials', lambda: self._load_annual_financials(None))
+
+    def _load_annual_financials(self, tickers):
+        """Query ANNUAL_FINANCIALS_10K, latest REPORT_DATE per year (None on error, so failures are not cached)"""
         cursor = None
+        in_list = None
         try:
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
             # Subquery deduplicates: one row per (TICKER, FISCAL_YEAR) using latest REPORT_DATE
             if tickers:
-                placeholders = ', '.join(['?' for _ in tickers])
+                ticker_filter, params = in_list('"TICKER"', tickers)
                 query = f"""
                 SELECT A.*
                 FROM "{self.schema}"."ANNUAL_FINANCIALS_10K" A
                 INNER JOIN (
                     SELECT "TICKER", "FISCAL_YEAR", MAX("REPORT_DATE") AS "MAX_DATE"
                     FROM "{self.schema}"."ANNUAL_FINANCIALS_10K"
-                    WHERE "TICKER" IN ({placeholders})
+                    WHERE {ticker_filter}
                     GROUP BY "TICKER", "FISCAL_YEAR"
                 ) B ON A."TICKER" = B."TICKER"
                    AND A."FISCAL_YEAR" = B."FISCAL_YEAR"
                    AND A."REPORT_DATE" = B."MAX_DATE"
                 ORDER BY A."TICKER", A."FISCAL_YEAR" DESC
                 """
-                cursor = self.hana_client.connection.cursor()
-                cursor.execute(query, tickers)
+                cursor.execute(query, params)
             else:
                 query = f"""
                 SELECT A.*
@@ -461,24 +592,11 @@ class FinancialDataService:
                    AND A."REPORT_DATE" = B."MAX_DATE"
                 ORDER BY A."TICKER", A."FISCAL_YEAR" DESC
                 """
-                cursor = self.hana_client.connection.cursor()
                 cursor.execute(query)
 
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-
-            df = pd.DataFrame(data, columns=columns)
+            df = fetch_frame(cursor)
             self.logger.info(f"Retrieved {len(df)} annual financials records (deduped)")
 
-            # HANA returns decimal.Decimal for DECIMAL columns — convert all to float
-            skip_cols = {'TICKER', 'REPORT_DATE'}
-            for col in df.columns:
-                if col not in skip_cols:
-                    try:
-                        df[col] = pd.to_numeric(df[col])
-                    except (ValueError, TypeError):
-                        pass
-
             # Normalize monetary columns to millions for dashboard consistency
             # (FINANCIAL_RATIOS and FINANCIAL_DATA_ADVANCED already store in millions)
             money_cols = [
@@ -493,15 +611,14 @@ class FinancialDataService:
                 if col in df.columns:
                     df[col] = df[col] / 1_000_000
 
-            # Cache the result
-            self._set_cached(cache_key, df)
-
             return df
 
         except Exception as e:
             self.logger.error(f"Error retrieving annual financials: {str(e)}")
-            return pd.DataFrame()
+            return None
         finally:
+            if in_list:
+                in_list.close()
             if cursor:
                 cursor.close()
 
@@ -520,6 +637,7 @@ class FinancialDataService:
             return pd.DataFrame()
 
         cursor = None
+        in_list = None
         try:
             # Validate metrics against allowed columns to prevent SQL injection
             allowed_metrics = {
@@ -537,30 +655,31 @@ class FinancialDataService:
             # Build column list with proper quoting
             column_list = ', '.join([f'"{metric}"' for metric in safe_metrics])
 
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
+
             # Build parameterized query for tickers
-            placeholders = ', '.join(['?' for _ in tickers])
+            ticker_filter, params = in_list('"TICKER"', tickers)
 
             query = f"""
             SELECT
                 "TICKER",
                 {column_list}
             FROM "{self.schema}"."FINANCIAL_RATIOS"
-            WHERE "TICKER" IN ({placeholders})
+            WHERE {ticker_filter}
             """
 
-            cursor = self.hana_client.connection.cursor()
-            cursor.execute(query, tickers)
-
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
+            cursor.execute(query, params)
 
-            df = pd.DataFrame(data, columns=columns)
+            df = fetch_frame(cursor)
             return df
 
         except Exception as e:
             self.logger.error(f"Error retrieving comparison data: {str(e)}")
             return pd.DataFrame()
         finally:
+            if in_list:
+                in_list.close()
             if cursor:
                 cursor.close()
 
@@ -596,70 +715,352 @@ class FinancialDataService:
             return pd.DataFrame()
 
         cursor = None
+        in_list = None
         try:
-            # Build dynamic query with filters
-            query = f"""
-            SELECT
-                "RBUKRS", "GJAHR", "BELNR", "DOCLN",
-                "BLDAT", "BUDAT",
-                "RACCT", "RCNTR", "PRCTR", "SEGMENT",
-                "HSL", "RHCUR", "KSL", "RKCUR",
-                "POPER", "DRCRK", "BLART",
-                "SGTXT", "BKTXT"
-            FROM "{self.schema}"."ACDOCA_SAMPLE"
-            WHERE 1=1
-            """
-            params = []
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
+            query, params = self._acdoca_query(in_list, company_codes, year, periods, accounts, cost_centers)
+            query += f' ORDER BY "BUDAT" DESC, "BELNR", "DOCLN" LIMIT {limit}'
 
-            if company_codes:
-                placeholders = ', '.join(['?' for _ in company_codes])
-                query += f' AND "RBUKRS" IN ({placeholders})'
-                params.extend(company_codes)
+            cursor.execute(query, params)
 
-            if year:
-                query += ' AND "GJAHR" = ?'
-                params.append(year)
+            df = fetch_frame(cursor)
+            self.logger.info(f"Retrieved {len(df)} ACDOCA records")
+            if len(df) == limit:
+                self.logger.warning(f"ACDOCA result truncated at {limit} rows; use iter_acdoca_data for full extracts")
 
-            if periods:
-                placeholders = ', '.join(['?' for _ in periods])
-                query += f' AND "POPER" IN ({placeholders})'
-                params.extend(periods)
+            return df
 
-            if accounts:
-                placeholders = ', '.join(['?' for _ in accounts])
-                query += f' AND "RACCT" IN ({placeholders})'
-                params.extend(accounts)
+        except Exception as e:
+            self.logger.error(f"Error retrieving ACDOCA data: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if in_list:
+                in_list.close()
+            if cursor:
+                cursor.close()
 
-            if cost_centers:
-                placeholders = ', '.join(['?' for _ in cost_centers])
-                query += f' AND "RCNTR" IN ({placeholders})'
-                params.extend(cost_centers)
+    def iter_acdoca_data(
+        self,
+        company_codes: list = None,
+        year: int = None,
+        periods: list = None,
+        accounts: list = None,
+        cost_centers: list = None,
+        chunk_size: int = 50000,
+        columns: list = None,
+        inserted_since=None
+    ):
+        """
+        Stream ACDOCA journal entries as typed DataFrame chunks
 
-            query += f' ORDER BY "BUDAT" DESC, "BELNR", "DOCLN" LIMIT {limit}'
+        Pages through the table with keyset (seek) predicates on the sort key
+        instead of OFFSET, so every page is an index range read and memory
+        stays bounded by chunk_size whatever the size of the result. Each page
+        takes a connection only while it is fetched.
 
-            cursor = self.hana_client.connection.cursor()
-            cursor.execute(query, params)
+        Args:
+            company_codes: List of company codes to filter
+            year: Fiscal year
+            periods: List of posting periods (1-12)
+            accounts: List of GL accounts
+            cost_centers: List of cost centers
+            chunk_size: Rows per chunk
+            columns: Columns to select (default ACDOCA_COLUMNS); the
+                ACDOCA_KEYSET columns are always added
+            inserted_since: Only lines with an "INSERTED_AT" at or after this timestamp
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the selected columns,
+                ordered by posting date (newest first) then document and line
+
+        Raises:
+            Exception: Query errors are logged and re-raised, so a failed
+                extract is never mistaken for a complete one
+        """
+        if not self.connected:
+            self.logger.error("Not connected to HANA")
+            return
+
+        chunk_size = max(1, int(chunk_size))
+        if columns:
+            columns = list(dict.fromkeys([*columns, *(column for column, _ in self.ACDOCA_KEYSET)]))
+        order_by = ', '.join(f'"{column}" {direction}' for column, direction in self.ACDOCA_KEYSET)
+        last_key = None
+        total = 0
+
+        while True:
+            cursor = None
+            in_list = None
+            try:
+                cursor = self.hana_client.cursor()
+                # Filters are bound per page: temporary IN-list tables belong to the page's connection
+                in_list = InListBinder(cursor)
+                query, params = self._acdoca_query(
+                    in_list, company_codes, year, periods, accounts, cost_centers, columns, inserted_since
+                )
+                if last_key is not None:
+                    predicate, predicate_params = _keyset_predicate(self.ACDOCA_KEYSET, last_key)
+                    query += f' AND {predicate}'
+                    params.extend(predicate_params)
+                query += f' ORDER BY {order_by} LIMIT {chunk_size}'
+
+                cursor.execute(query, params)
+                chunk = fetch_frame(cursor)
+            except Exception as e:
+                self.logger.error(f"Error streaming ACDOCA data after {total} records: {str(e)}")
+                raise
+            finally:
+                if in_list:
+                    in_list.close()
+                if cursor:
+                    cursor.close()
+
+            if chunk.empty:
+                break
+
+            total += len(chunk)
+            last_row = chunk.iloc[-1]
+            last_key = [_bind_value(last_row[column]) for column, _ in self.ACDOCA_KEYSET]
+            yield chunk
+
+            if len(chunk) < chunk_size:
+                break
+
+        self.logger.info(f"Streamed {total} ACDOCA records")
+
+    def get_acdoca_frame(
+        self,
+        company_codes: list = None,
+        year: int = None,
+        periods: list = None,
+        accounts: list = None,
+        cost_centers: list = None,
+        chunk_size: int = 50000
+    ):
+        """
+        Load ACDOCA journal entries as a CompactAcdocaFrame
 
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
+        Streams the lines without the text columns and encodes each chunk as
+        it arrives, so the full result is never held as Python strings:
+        dimensions become categoricals over the shared master-data
+        dictionaries, dates int32 day numbers. SGTXT/BKTXT are fetched by ID
+        only when the frame's texts() is called.
 
-            df = pd.DataFrame(data, columns=columns)
-            self.logger.info(f"Retrieved {len(df)} ACDOCA records")
+        Args:
+            company_codes: List of company codes to filter
+            year: Fiscal year
+            periods: List of posting periods (1-12)
+            accounts: List of GL accounts
+            cost_centers: List of cost centers
+            chunk_size: Rows per streamed chunk
 
-            # Convert decimal columns
-            for col in ['HSL', 'KSL']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col])
+        Returns:
+            CompactAcdocaFrame: All matching lines (empty on error)
+        """
+        dictionaries = self.get_acdoca_dictionaries()
+        columns = ['ID', *(column for column in self.ACDOCA_COLUMNS if column not in TEXT_COLUMNS)]
 
-            return df
+        try:
+            parts = [
+                CompactAcdocaFrame.from_frame(chunk, dictionaries, text_loader=self._load_acdoca_texts)
+                for chunk in self.iter_acdoca_data(
+                    company_codes, year, periods, accounts, cost_centers,
+                    chunk_size=chunk_size, columns=columns
+                )
+            ]
+        except Exception as e:
+            self.logger.error(f"Error loading compact ACDOCA frame: {str(e)}")
+            return CompactAcdocaFrame(pd.DataFrame())
+
+        compact = CompactAcdocaFrame.concat(parts)
+        self.logger.info(f"Loaded {len(compact)} ACDOCA records ({compact.memory_usage() / 1e6:.1f} MB)")
+        return compact
 
+    def refresh_acdoca_aggregates(
+        self,
+        aggregates=None,
+        company_codes: list = None,
+        year: int = None,
+        periods: list = None,
+        chunk_size: int = 50000
+    ):
+        """
+        Bring maintained ACDOCA aggregates up to date
+
+        Only lines inserted since the aggregates' INSERTED_AT watermark (less
+        their overlap window) are read and applied as deltas, so intraday
+        postings do not force a full reload; lines of the window that were
+        already applied are skipped by ID. Without aggregates all matching
+        lines are loaded once. Use the same filters on every refresh of one
+        aggregates object.
+
+        Args:
+            aggregates: AcdocaAggregates to update (None to build them)
+            company_codes: List of company codes to filter
+            year: Fiscal year
+            periods: List of posting periods (1-12)
+            chunk_size: Rows per streamed chunk
+
+        Returns:
+            AcdocaAggregates: The updated aggregates (unchanged on error)
+        """
+        aggregates = aggregates if aggregates is not None else AcdocaAggregates()
+        columns = ['ID', 'INSERTED_AT', *AcdocaAggregates.KEYS, *AcdocaAggregates.VALUES]
+
+        try:
+            applied = aggregates.apply_chunks(self.iter_acdoca_data(
+                company_codes, year, periods,
+                chunk_size=chunk_size, columns=columns, inserted_since=aggregates.since
+            ))
         except Exception as e:
-            self.logger.error(f"Error retrieving ACDOCA data: {str(e)}")
-            return pd.DataFrame()
+            self.logger.error(f"Error refreshing ACDOCA aggregates: {str(e)}")
+            return aggregates
+
+        self.logger.info(f"Applied {applied} new ACDOCA records (watermark {aggregates.watermark})")
+        return aggregates
+
+    def get_acdoca_dictionaries(self):
+        """
+        Get the category dictionaries for compact ACDOCA frames
+
+        Known values come from GL_ACCOUNTS, COST_CENTERS and COMPANY_CODES.
+        One instance is shared by all frames built from the same master data,
+        so values first seen in the journal lines get the same codes in every
+        frame too; it is replaced when the master data is reloaded.
+
+        Returns:
+            AcdocaDictionaries: Shared dictionaries seeded from master data
+        """
+        values = self._cached_query('acdoca_dictionaries', 'acdoca_dictionaries',
+                                    self._load_acdoca_dictionaries, default=dict)
+        shared = self._acdoca_dictionaries
+        if shared is None or shared[0] is not values:
+            shared = (values, AcdocaDictionaries(values))
+            self._acdoca_dictionaries = shared
+        return shared[1]
+
+    def _load_acdoca_dictionaries(self):
+        """Query the master-data values of the ACDOCA dimensions; returns None on error"""
+        if not self.connected:
+            self.logger.error("Not connected to HANA")
+            return None
+
+        masters = (
+            ('RACCT', 'GL_ACCOUNTS', 'RACCT'),
+            ('RCNTR', 'COST_CENTERS', 'RCNTR'),
+            ('PRCTR', 'COST_CENTERS', 'PRCTR'),
+            ('RBUKRS', 'COMPANY_CODES', 'RBUKRS'),
+            ('RHCUR', 'COMPANY_CODES', 'RHCUR'),
+        )
+
+        cursor = None
+        try:
+            cursor = self.hana_client.cursor()
+            values = {}
+            for column, table, source in masters:
+                cursor.execute(
+                    f'SELECT DISTINCT "{source}" FROM "{self.schema}"."{table}" '
+                    f'WHERE "{source}" IS NOT NULL ORDER BY "{source}"'
+                )
+                values[column] = [row[0] for row in cursor.fetchall()]
+
+            return values
+
+        except Exception as e:
+            self.logger.error(f"Error retrieving ACDOCA dictionaries: {str(e)}")
+            return None
         finally:
             if cursor:
                 cursor.close()
 
+    def _load_acdoca_texts(self, ids):
+        """
+        Fetch the text columns of ACDOCA lines (text loader of compact frames)
+
+        Args:
+            ids: ACDOCA_SAMPLE IDs
+
+        Returns:
+            pd.DataFrame: SGTXT and BKTXT indexed by ID
+        """
+        empty = pd.DataFrame(columns=list(TEXT_COLUMNS), index=pd.Index([], name='ID'))
+        if not self.connected or not ids:
+            return empty
+
+        cursor = None
+        in_list = None
+        try:
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
+            clause, params = in_list('"ID"', [int(i) for i in ids])
+            text_list = ', '.join(f'"{column}"' for column in TEXT_COLUMNS)
+            cursor.execute(
+                f'SELECT "ID", {text_list} FROM "{self.schema}"."ACDOCA_SAMPLE" WHERE {clause}',
+                params
+            )
+            return fetch_frame(cursor).set_index('ID')
+
+        except Exception as e:
+            self.logger.error(f"Error retrieving ACDOCA texts: {str(e)}")
+            return empty
+        finally:
+            if in_list:
+                in_list.close()
+            if cursor:
+                cursor.close()
+
+    def _acdoca_query(self, in_list, company_codes, year, periods, accounts, cost_centers, columns=None,
+                      inserted_since=None):
+        """
+        Build the filtered ACDOCA_SAMPLE SELECT shared by get_acdoca_data and iter_acdoca_data
+
+        Args:
+            in_list (InListBinder): Binder of the cursor that will run the query
+            columns: Columns to select (default ACDOCA_COLUMNS)
+            inserted_since: Only lines with an "INSERTED_AT" at or after this timestamp
+
+        Returns:
+            tuple: (query ending in the WHERE clause, parameter list)
+        """
+        select_list = ', '.join(f'"{column}"' for column in (columns or self.ACDOCA_COLUMNS))
+        query = f"""
+        SELECT {select_list}
+        FROM "{self.schema}"."ACDOCA_SAMPLE"
+        WHERE 1=1
+        """
+        params = []
+
+        if inserted_since is not None:
+            query += ' AND "INSERTED_AT" >= ?'
+            params.append(_bind_value(inserted_since))
+
+        if company_codes:
+            clause, clause_params = in_list('"RBUKRS"', company_codes)
+            query += f' AND {clause}'
+            params.extend(clause_params)
+
+        if year:
+            query += ' AND "GJAHR" = ?'
+            params.append(year)
+
+        if periods:
+            clause, clause_params = in_list('"POPER"', periods)
+            query += f' AND {clause}'
+            params.extend(clause_params)
+
+        if accounts:
+            clause, clause_params = in_list('"RACCT"', accounts)
+            query += f' AND {clause}'
+            params.extend(clause_params)
+
+        if cost_centers:
+            clause, clause_params = in_list('"RCNTR"', cost_centers)
+            query += f' AND {clause}'
+            params.extend(clause_params)
+
+        return query, params
+
     def get_acdoca_budget(
         self,
         company_codes: list = None,
@@ -682,7 +1083,11 @@ class FinancialDataService:
             return pd.DataFrame()
 
         cursor = None
+        in_list = None
         try:
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
+
             query = f"""
             SELECT
                 "RBUKRS", "GJAHR", "POPER",
@@ -694,38 +1099,32 @@ class FinancialDataService:
             params = []
 
             if company_codes:
-                placeholders = ', '.join(['?' for _ in company_codes])
-                query += f' AND "RBUKRS" IN ({placeholders})'
-                params.extend(company_codes)
+                clause, clause_params = in_list('"RBUKRS"', company_codes)
+                query += f' AND {clause}'
+                params.extend(clause_params)
 
             if year:
                 query += ' AND "GJAHR" = ?'
                 params.append(year)
 
             if periods:
-                placeholders = ', '.join(['?' for _ in periods])
-                query += f' AND "POPER" IN ({placeholders})'
-                params.extend(periods)
+                clause, clause_params = in_list('"POPER"', periods)
+                query += f' AND {clause}'
+                params.extend(clause_params)
 
-            cursor = self.hana_client.connection.cursor()
             cursor.execute(query, params)
 
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-
-            df = pd.DataFrame(data, columns=columns)
+            df = fetch_frame(cursor)
             self.logger.info(f"Retrieved {len(df)} budget records")
 
-            for col in ['HSL', 'KSL']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col])
-
             return df
 
         except Exception as e:
             self.logger.error(f"Error retrieving budget data: {str(e)}")
             return pd.DataFrame()
         finally:
+            if in_list:
+                in_list.close()
             if cursor:
                 cursor.close()
 
@@ -750,7 +1149,11 @@ class FinancialDataService:
             return pd.DataFrame()
 
         cursor = None
+        in_list = None
         try:
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
+
             # Determine grouping column
             group_col_map = {
                 'account': '"RACCT"',
@@ -774,9 +1177,9 @@ class FinancialDataService:
             params = []
 
             if company_codes:
-                placeholders = ', '.join(['?' for _ in company_codes])
-                query += f' AND "RBUKRS" IN ({placeholders})'
-                params.extend(company_codes)
+                clause, clause_params = in_list('"RBUKRS"', company_codes)
+                query += f' AND {clause}'
+                params.extend(clause_params)
 
             if year:
                 query += ' AND "GJAHR" = ?'
@@ -784,24 +1187,17 @@ class FinancialDataService:
 
             query += f' GROUP BY {group_col} ORDER BY SUM("KSL") DESC'
 
-            cursor = self.hana_client.connection.cursor()
             cursor.execute(query, params)
 
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-
-            df = pd.DataFrame(data, columns=columns)
-
-            for col in ['TOTAL_LOCAL', 'TOTAL_USD']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col])
-
+            df = fetch_frame(cursor)
             return df
 
         except Exception as e:
             self.logger.error(f"Error retrieving ACDOCA summary: {str(e)}")
             return pd.DataFrame()
         finally:
+            if in_list:
+                in_list.close()
             if cursor:
                 cursor.close()
 
@@ -824,7 +1220,11 @@ class FinancialDataService:
             return pd.DataFrame()
 
         cursor = None
+        in_list = None
         try:
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
+
             query = f"""
             SELECT
                 "GJAHR",
@@ -837,34 +1237,107 @@ class FinancialDataService:
             params = []
 
             if company_codes:
-                placeholders = ', '.join(['?' for _ in company_codes])
-                query += f' AND "RBUKRS" IN ({placeholders})'
-                params.extend(company_codes)
+                clause, clause_params = in_list('"RBUKRS"', company_codes)
+                query += f' AND {clause}'
+                params.extend(clause_params)
 
             if years:
-                placeholders = ', '.join(['?' for _ in years])
-                query += f' AND "GJAHR" IN ({placeholders})'
-                params.extend(years)
+                clause, clause_params = in_list('"GJAHR"', years)
+                query += f' AND {clause}'
+                params.extend(clause_params)
 
             query += ' GROUP BY "GJAHR", "POPER", "RACCT" ORDER BY "GJAHR", "POPER"'
 
-            cursor = self.hana_client.connection.cursor()
             cursor.execute(query, params)
 
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
+            df = fetch_frame(cursor)
+            return df
+
+        except Exception as e:
+            self.logger.error(f"Error retrieving P&L trend: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if in_list:
+                in_list.close()
+            if cursor:
+                cursor.close()
+
+    def get_acdoca_pl_summary(
+        self,
+        company_codes: list = None,
+        year: int = None,
+        periods: list = None,
+        currency: str = 'USD'
+    ):
+        """
+        Get the P&L summary aggregated in HANA
 
-            df = pd.DataFrame(data, columns=columns)
+        ACDOCAAnalytics.PL_STRUCTURE is compiled into a CASE mapping from account
+        to category, so HANA returns one row per category instead of journal
+        lines. Derived lines and margins are built by
+        ACDOCAAnalytics.build_pl_summary, the same as the in-memory get_pl_summary.
 
-            if 'AMOUNT_USD' in df.columns:
-                df['AMOUNT_USD'] = pd.to_numeric(df['AMOUNT_USD'])
+        Args:
+            company_codes: List of company codes
+            year: Fiscal year
+            periods: List of posting periods (1-12)
+            currency: 'USD' for global, 'LOCAL' for company currency
 
-            return df
+        Returns:
+            pd.DataFrame: P&L line items (Category, Amount, Margin %)
+        """
+        if not self.connected:
+            return pd.DataFrame()
+
+        cursor = None
+        in_list = None
+        try:
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
+
+            amount_col = '"KSL"' if currency == 'USD' else '"HSL"'
+            accounts = [acc for config in ACDOCAAnalytics.PL_STRUCTURE.values() for acc in config['accounts']]
+            account_list = ', '.join(f"'{acc}'" for acc in accounts)
+
+            query = f"""
+            SELECT "CATEGORY", SUM("AMOUNT") as "AMOUNT"
+            FROM (
+                SELECT
+                    {ACDOCAAnalytics.compile_pl_category_case('"RACCT"')} as "CATEGORY",
+                    {amount_col} as "AMOUNT"
+                FROM "{self.schema}"."ACDOCA_SAMPLE"
+                WHERE "RACCT" IN ({account_list})
+            """
+            params = []
+
+            if company_codes:
+                clause, clause_params = in_list('"RBUKRS"', company_codes)
+                query += f' AND {clause}'
+                params.extend(clause_params)
+
+            if year:
+                query += ' AND "GJAHR" = ?'
+                params.append(year)
+
+            if periods:
+                clause, clause_params = in_list('"POPER"', periods)
+                query += f' AND {clause}'
+                params.extend(clause_params)
+
+            query += ') GROUP BY "CATEGORY"'
+
+            cursor.execute(query, params)
+
+            df = fetch_frame(cursor)
+            category_totals = dict(zip(df['CATEGORY'], df['AMOUNT'])) if not df.empty else {}
+            return ACDOCAAnalytics.build_pl_summary(category_totals)
 
         except Exception as e:
-            self.logger.error(f"Error retrieving P&L trend: {str(e)}")
+            self.logger.error(f"Error retrieving ACDOCA P&L summary: {str(e)}")
             return pd.DataFrame()
         finally:
+            if in_list:
+                in_list.close()
             if cursor:
                 cursor.close()
 
@@ -885,7 +1358,7 @@ class FinancialDataService:
 
         cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
 
             # ACDOCA record count
             cursor.execute(f'SELECT COUNT(*) FROM "{self.schema}"."ACDOCA_SAMPLE"')
@@ -933,7 +1406,7 @@ class FinancialDataService:
 
         cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             
             cursor.execute("""
                 SELECT "MODEL_NAME", "MODEL_TYPE", "VERSION", 
@@ -972,7 +1445,7 @@ class FinancialDataService:
 
         cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             
             cursor.execute("""
                 SELECT "RUN_ID", "STATUS", "MODELS_TRAINED", 
@@ -4,8 +4,19 @@ Enhanced with ingestion logging capabilities
 """
 
 import datetime
+import decimal
+import hashlib
 import logging
 import json
+import numbers
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import pandas as pd
 
 # Import SAP HANA Python client
 try:
@@ -16,6 +27,503 @@ except ImportError:
     logging.warning("hdbcli package not installed. SAP HANA integration will not work.")
     logging.warning("Install using: pip install hdbcli")
 
+# Columns that never take part in the ROW_HASH content fingerprint
+NON_BUSINESS_COLUMNS = ('ID', 'INSERTED_AT', 'ROW_HASH', 'TIMESTAMP')
+
+# Bloomberg response keys feeding the identifier columns of every table
+_IDENTIFIER_FIELDS = {
+    'TICKER': 'ticker',
+    'IDENTIFIER_TYPE': 'identifierType',
+    'IDENTIFIER_VALUE': 'identifierValue',
+}
+
+# Nested dict columns of a Bloomberg response searched for field values, in priority order
+_NESTED_CONTAINERS = ('data', 'fields', 'values', 'results')
+
+# Separates a parent RUN_ID from the per-table sub-run number in INGESTION_LOGS
+SUB_RUN_SEPARATOR = '/'
+
+# Marks the end of a stage's output in the streaming ingestion pipeline
+_STREAM_END = object()
+
+# Scale of the DECIMAL(18,6) columns; numbers are hashed at this precision
+_HASH_SCALE = decimal.Decimal('0.000001')
+
+
+def _normalize_hash_value(value):
+    """Render a value the same way whether it came from Bloomberg or from HANA."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, numbers.Number):
+        try:
+            return str(decimal.Decimal(str(value)).quantize(_HASH_SCALE, rounding=decimal.ROUND_HALF_UP))
+        except decimal.InvalidOperation:
+            return str(value)
+    if isinstance(value, datetime.datetime):
+        if value.time() == datetime.time(0):
+            return value.date().isoformat()
+        return value.isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+def compute_row_hash(record, columns):
+    """
+    Compute the deterministic content fingerprint stored in ROW_HASH.
+
+    Args:
+        record (dict): Column name -> value
+        columns (list): Table columns; ID, INSERTED_AT and ROW_HASH are ignored
+
+    Returns:
+        str: 64-character hex SHA-256 digest
+    """
+    parts = [
+        f"{column}={_normalize_hash_value(record.get(column))}"
+        for column in sorted(columns)
+        if column not in NON_BUSINESS_COLUMNS
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode('utf-8')).hexdigest()
+
+
+def iter_frame_chunks(df, chunk_size):
+    """
+    Split an in-memory frame into chunks for HanaClient.ingest_stream.
+
+    Args:
+        df (DataFrame): Frame to split
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        DataFrame: Consecutive row slices of df
+    """
+    chunk_size = max(1, int(chunk_size))
+    for offset in range(0, len(df), chunk_size):
+        yield df.iloc[offset:offset + chunk_size]
+
+
+def _coerce_float(value):
+    return float(value)
+
+
+def _coerce_int(value):
+    return int(float(value))
+
+
+def _coerce_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def _coerce_timestamp(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time(0))
+    return datetime.datetime.fromisoformat(str(value))
+
+
+def _coerce_str(value):
+    return value if isinstance(value, str) else str(value)
+
+
+# HANA DATA_TYPE_NAME -> converter applied to Bloomberg values before binding
+_COERCERS_BY_TYPE = {
+    'DECIMAL': _coerce_float,
+    'SMALLDECIMAL': _coerce_float,
+    'DOUBLE': _coerce_float,
+    'REAL': _coerce_float,
+    'FLOAT': _coerce_float,
+    'INTEGER': _coerce_int,
+    'BIGINT': _coerce_int,
+    'SMALLINT': _coerce_int,
+    'TINYINT': _coerce_int,
+    'DATE': _coerce_date,
+    'TIMESTAMP': _coerce_timestamp,
+    'SECONDDATE': _coerce_timestamp,
+    'NVARCHAR': _coerce_str,
+    'VARCHAR': _coerce_str,
+    'NCLOB': _coerce_str,
+}
+
+
+class HanaConnectionPool:
+    """
+    Thread-safe pool of SAP HANA connections.
+
+    Connections are validated on checkout: a disconnected handle, or one that
+    has been idle longer than validate_after_idle seconds and fails a probe
+    query, is replaced transparently. Wait and hold times are tracked so pool
+    pressure shows up in the logs and get_metrics().
+    """
+
+    def __init__(self, connect_fn, min_size=1, max_size=5, timeout=30, validate_after_idle=30):
+        """
+        Initialize the pool and open min_size connections.
+
+        Args:
+            connect_fn (callable): Opens and returns a new DB-API connection
+            min_size (int): Connections opened up front and kept idle
+            max_size (int): Upper bound on open connections
+            timeout (float): Seconds to wait for a free connection before failing
+            validate_after_idle (float): Idle seconds after which a probe query is run
+        """
+        self.logger = logging.getLogger(__name__)
+        self._connect = connect_fn
+        self.min_size = max(0, int(min_size))
+        self.max_size = max(1, int(max_size), self.min_size)
+        self.timeout = timeout
+        self.validate_after_idle = validate_after_idle
+
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, last_used) pairs, most recently used last
+        self._size = 0
+        self._closed = False
+
+        self._metrics = {
+            'checkouts': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'hold_ms_total': 0.0,
+            'hold_ms_max': 0.0,
+            'reconnects': 0,
+            'timeouts': 0,
+        }
+
+        for _ in range(self.min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def acquire(self):
+        """
+        Check a healthy connection out of the pool.
+
+        Returns:
+            Connection: An open DB-API connection; hand it back with release()
+
+        Raises:
+            TimeoutError: If no connection became free within the pool timeout
+        """
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.timeout
+        connection = None
+        last_used = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("HANA connection pool is closed")
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise TimeoutError(f"No HANA connection available within {self.timeout}s")
+                self._cond.wait(remaining)
+
+        try:
+            if connection is None:
+                connection = self._connect()
+            elif not self._is_healthy(connection, last_used):
+                self._discard(connection)
+                connection = self._connect()
+                with self._cond:
+                    self._metrics['reconnects'] += 1
+                self.logger.info("Replaced stale pooled HANA connection")
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        with self._cond:
+            self._metrics['checkouts'] += 1
+            self._metrics['wait_ms_total'] += wait_ms
+            self._metrics['wait_ms_max'] = max(self._metrics['wait_ms_max'], wait_ms)
+
+        return connection
+
+    def release(self, connection, checkout_start=None, discard=False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            connection: Connection obtained from acquire()
+            checkout_start (float): time.perf_counter() at checkout, for hold metrics
+            discard (bool): Close the connection instead of reusing it
+        """
+        if checkout_start is not None:
+            hold_ms = (time.perf_counter() - checkout_start) * 1000
+        else:
+            hold_ms = 0.0
+
+        with self._cond:
+            self._metrics['hold_ms_total'] += hold_ms
+            self._metrics['hold_ms_max'] = max(self._metrics['hold_ms_max'], hold_ms)
+
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._cond.notify()
+
+        if connection is not None:
+            self._discard(connection)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager checkout: ``with pool.connection() as conn: ...``
+
+        A connection that is no longer connected after an error is discarded.
+        """
+        connection = self.acquire()
+        start = time.perf_counter()
+        broken = False
+        try:
+            yield connection
+        except Exception:
+            broken = not self._is_connected(connection)
+            raise
+        finally:
+            self.release(connection, start, discard=broken)
+
+    def get_metrics(self):
+        """
+        Get pool usage statistics.
+
+        Returns:
+            dict: Sizes, checkout count, wait/hold times (ms), reconnects and timeouts
+        """
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics['size'] = self._size
+            metrics['idle'] = len(self._idle)
+            metrics['in_use'] = self._size - len(self._idle)
+            metrics['max_size'] = self.max_size
+
+        checkouts = metrics['checkouts']
+        metrics['avg_wait_ms'] = round(metrics['wait_ms_total'] / checkouts, 2) if checkouts else 0.0
+        metrics['avg_hold_ms'] = round(metrics['hold_ms_total'] / checkouts, 2) if checkouts else 0.0
+        return metrics
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._size -= len(idle)
+            self._idle = []
+            self._cond.notify_all()
+
+        for connection in idle:
+            self._discard(connection)
+
+    def _is_connected(self, connection):
+        try:
+            return bool(connection.isconnected())
+        except Exception:
+            return False
+
+    def _is_healthy(self, connection, last_used):
+        """Cheap client-side check, plus a probe query after a long idle period."""
+        if not self._is_connected(connection):
+            return False
+        if time.monotonic() - last_used < self.validate_after_idle:
+            return True
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1 FROM DUMMY")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class PooledCursor:
+    """
+    Cursor on a pooled connection; closing it returns the connection to the pool.
+
+    Behaves like the underlying DB-API cursor and exposes the connection it
+    runs on as ``cursor.connection`` for commit/rollback.
+    """
+
+    def __init__(self, pool, connection):
+        self.connection = connection
+        self._pool = pool
+        self._cursor = connection.cursor()
+        self._checkout_start = time.perf_counter()
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """Close the cursor and hand the connection back to the pool."""
+        if self._released:
+            return
+        self._released = True
+        try:
+            self._cursor.close()
+        except Exception:
+            pass
+        finally:
+            if self._pool is not None:
+                self._pool.release(self.connection, self._checkout_start)
+
+    def __del__(self):
+        # Safety net for callers that return or raise without closing
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class PreparedStatementCache:
+    """
+    Per-connection LRU cache of prepared statements.
+
+    Each connection keeps one cursor per statement text it has prepared, so
+    repeated batches with the same column signature are executed without
+    being parsed and prepared again on the server. Hits and misses are
+    counted for get_metrics().
+    """
+
+    def __init__(self, max_per_connection=32, max_connections=32):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_per_connection (int): Prepared statements kept per connection
+            max_connections (int): Connections tracked before the oldest is dropped
+        """
+        self.max_per_connection = max(1, int(max_per_connection))
+        self.max_connections = max(1, int(max_connections))
+
+        self._lock = threading.Lock()
+        self._caches = {}  # id(connection) -> (connection, OrderedDict of sql -> cursor)
+        self._metrics = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, connection, sql):
+        """
+        Get a cursor with sql prepared on connection, preparing it on a miss.
+
+        Args:
+            connection: DB-API connection the statement runs on
+            sql (str): Statement text
+
+        Returns:
+            Cursor to pass to execute/executemany together with sql
+        """
+        with self._lock:
+            entry = self._caches.get(id(connection))
+            if entry is None or entry[0] is not connection:
+                if entry is not None:
+                    self._close_cursors(entry[1])  # id reused by a new connection
+                elif len(self._caches) >= self.max_connections:
+                    self._close_cursors(self._caches.pop(next(iter(self._caches)))[1])
+                entry = (connection, OrderedDict())
+                self._caches[id(connection)] = entry
+
+            statements = entry[1]
+            cursor = statements.get(sql)
+            if cursor is not None:
+                statements.move_to_end(sql)
+                self._metrics['hits'] += 1
+                return cursor
+            self._metrics['misses'] += 1
+
+        cursor = connection.cursor()
+        if hasattr(cursor, 'prepare'):
+            cursor.prepare(sql)
+
+        with self._lock:
+            statements[sql] = cursor
+            while len(statements) > self.max_per_connection:
+                _, evicted = statements.popitem(last=False)
+                self._metrics['evictions'] += 1
+                self._close_cursors({None: evicted})
+
+        return cursor
+
+    @staticmethod
+    def execute(cursor, sql, values):
+        """Execute a cached statement with one row of bind values."""
+        if hasattr(cursor, 'executeprepared'):
+            return cursor.executeprepared(values)
+        return cursor.execute(sql, values)
+
+    @staticmethod
+    def executemany(cursor, sql, rows):
+        """Execute a cached statement as an array bind of many rows."""
+        if hasattr(cursor, 'executemanyprepared'):
+            return cursor.executemanyprepared(rows)
+        return cursor.executemany(sql, rows)
+
+    def discard(self, connection):
+        """Drop the statements of a connection, e.g. after it failed or was closed."""
+        with self._lock:
+            entry = self._caches.pop(id(connection), None)
+        if entry is not None and entry[0] is connection:
+            self._close_cursors(entry[1])
+
+    def clear(self):
+        """Close every cached cursor."""
+        with self._lock:
+            caches, self._caches = self._caches, {}
+        for _, statements in caches.values():
+            self._close_cursors(statements)
+
+    def get_metrics(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, hit_rate and cached statements
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['statements'] = sum(len(statements) for _, statements in self._caches.values())
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_rate'] = round(metrics['hits'] / lookups, 3) if lookups else 0.0
+        return metrics
+
+    @staticmethod
+    def _close_cursors(statements):
+        for cursor in statements.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
 class HanaClient:
     """Client for interacting with SAP HANA database."""
 
@@ -42,6 +550,34 @@ class HanaClient:
         # Connection will be set later
         self.connection = None
 
+        # Pooled connections for concurrent readers (dashboard callbacks, services)
+        self.pool = None
+        self.pool_min_size = int(config['hana'].get('pool_min_size', 1))
+        self.pool_max_size = int(config['hana'].get('pool_max_size', 5))
+
+        # Rows sent per executemany round trip by the bulk insert path
+        self.insert_batch_size = max(1, int(config['hana'].get('insert_batch_size', 1000)))
+
+        # Prepared INSERT statements reused per connection and column signature
+        self.statement_cache = PreparedStatementCache(
+            max_per_connection=config['hana'].get('statement_cache_size', 32))
+        self._insert_sql = {}
+
+        # Tables loaded concurrently by ingest_tables, each on its own pooled connection
+        self.ingest_max_workers = max(1, int(config['hana'].get('ingest_max_workers', 3)))
+
+        # Callbacks run when an ingestion run lands (e.g. result cache invalidation)
+        self._ingestion_listeners = []
+
+        # Throughput of the most recent insert_data call on this client, for
+        # diagnostics only: runs pass their own stats to log_ingestion_end
+        self.last_insert_stats = None
+
+        # Column metadata per (schema, table) and schemas known to exist,
+        # so insert and DDL helpers don't hit SYS views on every call
+        self._table_metadata = {}
+        self._known_schemas = set()
+
         # Define table schemas for different data types
         self.table_schemas = {
             'FINANCIAL_RATIOS': """
@@ -62,7 +598,8 @@ class HanaClient:
                     "EBITDA_MARGIN" DECIMAL(18,6),
                     "TOT_LIAB_AND_EQY" DECIMAL(18,6),
                     "NET_DEBT_TO_SHRHLDR_EQTY" DECIMAL(18,6),
-                    "INSERTED_AT" TIMESTAMP
+                    "INSERTED_AT" TIMESTAMP,
+                    "ROW_HASH" NVARCHAR(64)
                 )
             """,
             'FINANCIAL_DATA_ADVANCED': """
@@ -155,7 +692,8 @@ class HanaClient:
                     "WORKING_CAPITAL" DECIMAL(18,6),
                     "CF_FREE_CASH_FLOW" DECIMAL(18,6),
                     "NET_INC_GROWTH" DECIMAL(18,6),
-                    "INSERTED_AT" TIMESTAMP
+                    "INSERTED_AT" TIMESTAMP,
+                    "ROW_HASH" NVARCHAR(64)
                 )
             """,
             'ANNUAL_FINANCIALS_10K': """
@@ -195,7 +733,8 @@ class HanaClient:
                     "TOT_DEBT_TO_EBITDA" DECIMAL(18,6),
                     "INTEREST_COVERAGE_RATIO" DECIMAL(18,6),
                     "RETURN_ON_ASSET" DECIMAL(18,6),
-                    "RETURN_COM_EQY" DECIMAL(18,6)
+                    "RETURN_COM_EQY" DECIMAL(18,6),
+                    "ROW_HASH" NVARCHAR(64)
                 )
             """,
             'INGESTION_LOGS': """
@@ -234,31 +773,117 @@ class HanaClient:
         """
         Establish a connection to SAP HANA database.
 
+        Opens the primary connection used for DDL and ingestion and a pool of
+        connections handed out by cursor() to concurrent readers.
+
         Returns:
             bool: True if connection successful, False otherwise
         """
         try:
-            self.connection = dbapi.connect(
-                address=self.address,
-                port=int(self.port),
-                user=self.user,
-                password=self.password
+            self.connection = self._open_connection()
+
+            self.pool = HanaConnectionPool(
+                self._open_connection,
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size
             )
 
-            self.logger.info("Connected to SAP HANA at %s:%s", self.address, self.port)
+            self.logger.info("Connected to SAP HANA at %s:%s (pool %s-%s)",
+                             self.address, self.port, self.pool_min_size, self.pool_max_size)
             return True
 
         except Exception as e:
             self.logger.error("Failed to connect to SAP HANA: %s", str(e))
             return False
 
+    def _open_connection(self):
+        """Open a new DB-API connection with the configured credentials."""
+        return dbapi.connect(
+            address=self.address,
+            port=int(self.port),
+            user=self.user,
+            password=self.password
+        )
+
     def close(self):
         """Close the connection to SAP HANA database."""
+        self.statement_cache.clear()
+        if self.pool:
+            self.pool.close()
+            self.pool = None
         if self.connection:
             self.connection.close()
             self.logger.info("Closed connection to SAP HANA")
             self.connection = None
 
+    def cursor(self):
+        """
+        Open a cursor on a pooled connection.
+
+        Close the cursor (or use it as a context manager) to return its
+        connection to the pool. Without a pool the primary connection is used.
+
+        Returns:
+            PooledCursor: Cursor wrapper exposing ``.connection`` for commits
+        """
+        if self.pool is None:
+            return PooledCursor(None, self.connection)
+
+        return PooledCursor(self.pool, self.pool.acquire())
+
+    @contextmanager
+    def pooled_connection(self):
+        """
+        Check out a pooled connection: ``with client.pooled_connection() as conn: ...``
+
+        Yields the primary connection when no pool has been created.
+        """
+        if self.pool is None:
+            yield self.connection
+            return
+
+        with self.pool.connection() as connection:
+            yield connection
+
+    @contextmanager
+    def _manual_commit(self, connection):
+        """
+        Turn autocommit off on a connection for the duration of the block.
+
+        hdbcli connections autocommit every statement by default, which makes
+        rollback() a no-op; the bulk insert paths need a failed executemany
+        to be undone before its rows are retried. Uncommitted work is rolled
+        back if the block raises, and the previous mode is restored on exit,
+        so pooled connections go back unchanged.
+        """
+        previous = connection.getautocommit()
+        connection.setautocommit(False)
+        try:
+            yield connection
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.setautocommit(previous)
+
+    def get_pool_metrics(self):
+        """
+        Get connection pool statistics.
+
+        Returns:
+            dict: Pool metrics, empty when not connected
+        """
+        return self.pool.get_metrics() if self.pool else {}
+
+    def get_statement_cache_metrics(self):
+        """
+        Get prepared statement cache statistics.
+
+        Returns:
+            dict: hits, misses, evictions, hit_rate and cached statements
+        """
+        return self.statement_cache.get_metrics()
+
     def create_schema_if_not_exists(self, schema_name):
         """
         Create a schema in SAP HANA if it doesn't exist.
@@ -273,6 +898,9 @@ class HanaClient:
             self.logger.error("No connection to SAP HANA. Cannot create schema.")
             return False
 
+        if schema_name in self._known_schemas:
+            return True
+
         try:
             cursor = self.connection.cursor()
 
@@ -291,6 +919,7 @@ class HanaClient:
             else:
                 self.logger.debug(f'Schema "{schema_name}" already exists')
 
+            self._known_schemas.add(schema_name)
             cursor.close()
             return True
 
@@ -316,13 +945,8 @@ class HanaClient:
         try:
             cursor = self.connection.cursor()
 
-            # First check if table exists
-            cursor.execute("""
-            SELECT COUNT(*) FROM SYS.TABLES
-            WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
-            """, [schema_name, table_name])
-
-            table_exists = cursor.fetchone()[0] > 0
+            # First check if table exists (answered from the metadata cache when warm)
+            table_exists = self._get_table_metadata(cursor, schema_name, table_name) is not None
 
             if not table_exists:
                 # Determine which table schema to use
@@ -344,7 +968,12 @@ class HanaClient:
                         schema=schema_name, table=table_name)
 
                 cursor.execute(create_table_sql)
+                self.invalidate_table_metadata(schema_name, table_name)
                 self.logger.info(f'Created table "{schema_name}"."{table_name}"')
+
+                # Bloomberg tables get a unique index on their content fingerprint
+                if '"ROW_HASH"' in create_table_sql:
+                    self._create_row_hash_index(cursor, schema_name, table_name)
             else:
                 self.logger.debug(f'Table "{schema_name}"."{table_name}" already exists')
 
@@ -355,125 +984,831 @@ class HanaClient:
             self.logger.error(f"Error creating HANA table: {str(e)}")
             return False
 
-    def insert_data(self, df, schema_name, table_name):
+    def insert_data(self, df, schema_name, table_name, batch_size=None, return_stats=False):
         """
         Insert data from DataFrame to SAP HANA table.
 
+        Rows are grouped by the set of columns they actually carry and sent
+        through cursor.executemany in batches, committing after each batch.
+        A batch that fails is retried row by row so one bad record does not
+        drop its neighbours.
+
         Args:
             df (DataFrame): The pandas DataFrame containing Bloomberg data
             schema_name (str): The schema name in SAP HANA
             table_name (str): The table name to insert into
+            batch_size (int): Rows per executemany call (defaults to insert_batch_size)
+            return_stats (bool): Also return the throughput stats of this insert,
+                to pass to log_ingestion_end as insert_stats
 
         Returns:
-            int: The number of rows inserted
+            int: The number of rows inserted, or (rows, stats) with return_stats
+                (stats is None when the insert failed)
         """
         if not self.connection:
             self.logger.error("No connection to SAP HANA. Cannot insert data.")
-            return 0
+            return (0, None) if return_stats else 0
+
+        batch_size = max(1, int(batch_size or self.insert_batch_size))
 
         try:
             cursor = self.connection.cursor()
-            rows_inserted = 0
+            start = time.perf_counter()
             timestamp = datetime.datetime.now()
 
-            # Get column metadata for the table
-            cursor.execute("""
-            SELECT COLUMN_NAME FROM SYS.TABLE_COLUMNS
-            WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
-            AND COLUMN_NAME != 'ID'
-            ORDER BY POSITION
-            """, [schema_name, table_name])
+            metadata = self._get_table_metadata(cursor, schema_name, table_name)
+            columns = self._get_table_columns(cursor, schema_name, table_name)
+            coercers = metadata['coercers'] if metadata else {}
 
-            columns = [row[0] for row in cursor.fetchall()]
+            extracted = self._extract_frame(df, columns, coercers)
 
-            # Process the Bloomberg API response DataFrame
-            for index, row in df.iterrows():
-                try:
-                    # Extract identifier info
-                    ticker = row.get('ticker', '')
-                    identifier_type = row.get('identifierType', '')
-                    identifier_value = row.get('identifierValue', '')
-
-                    # Build the insert SQL dynamically based on available columns
-                    column_names = []
-                    placeholders = []
-                    values = []
-
-                    # Always add the common columns
-                    column_names.extend(['"TICKER"', '"IDENTIFIER_TYPE"', '"IDENTIFIER_VALUE"', '"INSERTED_AT"'])
-                    placeholders.extend(['?', '?', '?', '?'])
-                    values.extend([ticker, identifier_type, identifier_value, timestamp])
-
-                    # Add available data fields
-                    for column in columns:
-                        if column not in ['TICKER', 'IDENTIFIER_TYPE', 'IDENTIFIER_VALUE', 'TIMESTAMP']:
-                            field_name = column  # Column names in HANA are typically uppercase
-                            field_value = self._extract_value(row, field_name)
-
-                            if field_value is not None:
-                                column_names.append(f'"{column}"')
-                                placeholders.append('?')
-                                values.append(field_value)
-
-                    # Construct and execute SQL
-                    insert_sql = f"""
-                    INSERT INTO "{schema_name}"."{table_name}" (
-                        {", ".join(column_names)}
-                    ) VALUES ({", ".join(placeholders)})
-                    """
-
-                    cursor.execute(insert_sql, values)
-                    rows_inserted += 1
-
-                except Exception as row_error:
-                    self.logger.warning(f"Error inserting row {index}: {str(row_error)}")
-                    continue
+            # All rows share one column signature so they reuse one prepared INSERT
+            signature = self._insert_signature(extracted, columns)
+            grouped_rows = {signature: [
+                self._build_insert_row(extracted, index, signature, columns, timestamp)
+                for index in range(len(df))
+            ]} if len(df) else {}
+
+            rows_inserted, batches = self._execute_insert_batches(
+                schema_name, table_name, grouped_rows, batch_size)
 
-            self.connection.commit()
             cursor.close()
 
-            self.logger.info(f'Inserted {rows_inserted} rows into "{schema_name}"."{table_name}"')
-            return rows_inserted
+            stats = self._insert_stats(rows_inserted, batches, start)
+            self.last_insert_stats = stats
+            self.logger.info(
+                f'Inserted {rows_inserted} rows into "{schema_name}"."{table_name}" '
+                f'in {batches} batches ({stats["rows_per_sec"]} rows/sec, '
+                f'statement cache hit rate {stats["statement_cache_hit_rate"]})')
+            return (rows_inserted, stats) if return_stats else rows_inserted
 
         except Exception as e:
             self.logger.error(f"Error inserting data to HANA: {str(e)}")
+            return (0, None) if return_stats else 0
+
+    def _get_table_metadata(self, cursor, schema_name, table_name):
+        """
+        Get cached column metadata of a table, loading it from SYS.TABLE_COLUMNS once.
+
+        Args:
+            cursor: Open HANA cursor
+            schema_name (str): Schema name
+            table_name (str): Table name
+
+        Returns:
+            dict: 'columns' (names in position order), 'types', 'positions' and
+                'coercers' keyed by column name, or None if the table does not exist
+        """
+        key = (schema_name, table_name)
+        metadata = self._table_metadata.get(key)
+        if metadata is not None:
+            return metadata
+
+        cursor.execute("""
+        SELECT COLUMN_NAME, DATA_TYPE_NAME, POSITION FROM SYS.TABLE_COLUMNS
+        WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
+        ORDER BY POSITION
+        """, [schema_name, table_name])
+
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+
+        metadata = {
+            'columns': [row[0] for row in rows],
+            'types': {row[0]: row[1] for row in rows},
+            'positions': {row[0]: row[2] for row in rows},
+            'coercers': {row[0]: _COERCERS_BY_TYPE.get(row[1], lambda v: v) for row in rows},
+        }
+        self._table_metadata[key] = metadata
+        self._known_schemas.add(schema_name)
+        return metadata
+
+    def table_exists(self, schema_name, table_name):
+        """
+        Check whether a table exists (answered from the metadata cache when warm).
+
+        Args:
+            schema_name (str): Schema name
+            table_name (str): Table name
+
+        Returns:
+            bool: True if the table exists
+        """
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            return self._get_table_metadata(cursor, schema_name, table_name) is not None
+        finally:
+            cursor.close()
+
+    def invalidate_table_metadata(self, schema_name=None, table_name=None):
+        """
+        Drop cached column metadata after DDL.
+
+        Args:
+            schema_name (str): Schema to invalidate (all schemas when omitted)
+            table_name (str): Table to invalidate (all tables of the schema when omitted)
+        """
+        if schema_name is None:
+            self._table_metadata.clear()
+        elif table_name is None:
+            for key in [k for k in self._table_metadata if k[0] == schema_name]:
+                del self._table_metadata[key]
+        else:
+            self._table_metadata.pop((schema_name, table_name), None)
+
+    def _get_table_columns(self, cursor, schema_name, table_name):
+        """
+        Get the insertable column names of a table in position order.
+
+        Args:
+            cursor: Open HANA cursor
+            schema_name (str): Schema name
+            table_name (str): Table name
+
+        Returns:
+            list: Column names excluding the identity column
+        """
+        metadata = self._get_table_metadata(cursor, schema_name, table_name)
+        if metadata is None:
+            return []
+        return [column for column in metadata['columns'] if column != 'ID']
+
+    def _coerce_value(self, value, coercer):
+        """
+        Convert a Bloomberg value to the Python type of its HANA column.
+
+        Args:
+            value: Raw value from the response
+            coercer: Converter resolved from the column's DATA_TYPE_NAME
+
+        Returns:
+            Converted value, or None for missing/unparseable values (NaN, '#N/A')
+        """
+        if value is None or (isinstance(value, float) and value != value):
+            return None
+        try:
+            return coercer(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    def _build_extraction_plan(self, df, columns):
+        """
+        Resolve where each HANA column's value lives in a Bloomberg response frame.
+
+        Lookup order matches the response shapes we receive: an exact column,
+        a case-insensitive column, then keys of the nested 'data', 'fields',
+        'values' and 'results' dicts. Nested keys are collected in one pass per
+        container instead of being searched for every row.
+
+        Args:
+            df (DataFrame): Bloomberg response frame
+            columns (list): Target table columns
+
+        Returns:
+            dict: Column name -> list of (container, key) sources; container is
+                None for top-level frame columns, the list is empty when not found
+        """
+        frame_columns = {str(c).upper(): c for c in reversed(list(df.columns))}
+
+        nested_keys = {}
+        for container in _NESTED_CONTAINERS:
+            if container not in df.columns:
+                continue
+            keys = {}
+            for nested in df[container]:
+                if isinstance(nested, dict):
+                    for key in nested:
+                        keys.setdefault(str(key).upper(), []).append(key)
+            nested_keys[container] = {upper: list(dict.fromkeys(found)) for upper, found in keys.items()}
+
+        plan = {}
+        for column in columns:
+            if column in _IDENTIFIER_FIELDS:
+                field = _IDENTIFIER_FIELDS[column]
+                plan[column] = [(None, field)] if field in df.columns else []
+            elif column in df.columns:
+                plan[column] = [(None, column)]
+            elif column.upper() in frame_columns:
+                plan[column] = [(None, frame_columns[column.upper()])]
+            else:
+                plan[column] = [
+                    (container, key)
+                    for container, keys in nested_keys.items()
+                    for key in keys.get(column.upper(), [])
+                ]
+
+        return plan
+
+    def _extract_frame(self, df, columns, coercers):
+        """
+        Pull and type-convert every target column of a response frame column-wise.
+
+        Args:
+            df (DataFrame): Bloomberg response frame
+            columns (list): Target table columns
+            coercers (dict): Column name -> type converter from the metadata cache
+
+        Returns:
+            dict: Column name -> list of values, one per frame row (identifier
+                columns are always present)
+        """
+        row_count = len(df)
+        plan = self._build_extraction_plan(df, list(_IDENTIFIER_FIELDS) + [
+            c for c in columns if c not in _IDENTIFIER_FIELDS and c not in NON_BUSINESS_COLUMNS])
+        nested_values = {c: df[c].tolist() for c in _NESTED_CONTAINERS if c in df.columns}
+
+        extracted = {}
+        for column, sources in plan.items():
+            coercer = coercers.get(column)
+
+            if not sources:
+                default = '' if column in _IDENTIFIER_FIELDS else None
+                extracted[column] = [default] * row_count
+                continue
+
+            if sources[0][0] is None:
+                extracted[column] = self._series_values(df[sources[0][1]], coercer)
+                continue
+            else:
+                values = [None] * row_count
+                for container, key in sources:
+                    for index, nested in enumerate(nested_values[container]):
+                        if values[index] is None and isinstance(nested, dict) and key in nested:
+                            values[index] = nested[key]
+
+            if coercer is not None:
+                values = [self._coerce_value(value, coercer) for value in values]
+            extracted[column] = values
+
+        return extracted
+
+    def _series_values(self, series, coercer):
+        """
+        Convert a frame column to bind values for its HANA type.
+
+        Numeric and date columns are converted vectorized; unparseable values
+        and NaN become None (NULL).
+
+        Args:
+            series (Series): Source column
+            coercer: Converter resolved from the column's DATA_TYPE_NAME, or None
+
+        Returns:
+            list: Python values ready for executemany
+        """
+        if coercer is _coerce_float or coercer is _coerce_int:
+            numeric = pd.to_numeric(series, errors='coerce')
+            values = numeric.astype(object).where(numeric.notna(), None).tolist()
+            if coercer is _coerce_int:
+                values = [None if value is None else int(value) for value in values]
+            return values
+
+        if coercer is _coerce_date:
+            dates = pd.to_datetime(series, errors='coerce')
+            return dates.dt.date.astype(object).where(dates.notna(), None).tolist()
+
+        values = series.tolist()
+        if coercer is None:
+            return values
+        return [self._coerce_value(value, coercer) for value in values]
+
+    def _insert_signature(self, extracted, columns):
+        """
+        Get the column list of the INSERT statement for an extracted frame.
+
+        Columns without a value in any row are left out; the rest are bound
+        for every row (NULL where a row has no value), so a frame maps to a
+        single statement instead of one per null pattern.
+
+        Args:
+            extracted (dict): Column-wise values from _extract_frame
+            columns (list): Target table columns
+
+        Returns:
+            tuple: Column names in bind order
+        """
+        # Identifier and load-time columns are bound whenever the table has them
+        column_names = [column for column in ('TICKER', 'IDENTIFIER_TYPE', 'IDENTIFIER_VALUE', 'INSERTED_AT')
+                        if column in columns]
+        column_names.extend(
+            column for column in columns
+            if column in extracted and column not in _IDENTIFIER_FIELDS
+            and any(value is not None for value in extracted[column])
+        )
+        if 'ROW_HASH' in columns:
+            column_names.append('ROW_HASH')
+        return tuple(column_names)
+
+    def _build_insert_row(self, extracted, index, signature, columns, timestamp):
+        """
+        Build the bind values of one Bloomberg record for an INSERT signature.
+
+        Args:
+            extracted (dict): Column-wise values from _extract_frame
+            index (int): Row position in the frame
+            signature (tuple): Column names from _insert_signature
+            columns (list): Target table columns (for the ROW_HASH)
+            timestamp (datetime): INSERTED_AT value for this load
+
+        Returns:
+            list: Values in signature order
+        """
+        record = {column: extracted[column][index] for column in signature if column in extracted}
+        if 'INSERTED_AT' in signature:
+            record['INSERTED_AT'] = timestamp
+        if 'ROW_HASH' in signature:
+            record['ROW_HASH'] = compute_row_hash(record, columns)
+        return [record[column] for column in signature]
+
+    def _build_insert_sql(self, schema_name, table_name, column_names):
+        """Build (once per signature) a parameterized INSERT statement."""
+        key = (schema_name, table_name, tuple(column_names))
+        insert_sql = self._insert_sql.get(key)
+        if insert_sql is None:
+            target = f'"{schema_name}"."{table_name}"' if schema_name else f'"{table_name}"'
+            insert_sql = f"""
+        INSERT INTO {target} (
+            {", ".join(f'"{column}"' for column in column_names)}
+        ) VALUES ({", ".join('?' for _ in column_names)})
+        """
+            self._insert_sql[key] = insert_sql
+        return insert_sql
+
+    def _execute_insert_batches(self, schema_name, table_name, grouped_rows, batch_size, connection=None):
+        """
+        Send grouped rows to HANA with executemany, committing per batch.
+
+        Each signature's INSERT is taken from the statement cache, so it is
+        prepared once per connection rather than once per call. Autocommit is
+        off while the batches run, so a failed batch is rolled back before
+        its rows are retried one by one.
+
+        Args:
+            schema_name (str): Schema name
+            table_name (str): Table name
+            grouped_rows (dict): Column signature -> list of value lists
+            batch_size (int): Rows per executemany call
+            connection: Connection to insert on (defaults to the primary connection)
+
+        Returns:
+            tuple: (rows_inserted, batches_sent)
+        """
+        connection = connection or self.connection
+        rows_inserted = 0
+        batches = 0
+
+        with self._manual_commit(connection):
+            for column_names, rows in grouped_rows.items():
+                insert_sql = self._build_insert_sql(schema_name, table_name, column_names)
+                cursor = self.statement_cache.get(connection, insert_sql)
+
+                for offset in range(0, len(rows), batch_size):
+                    batch = rows[offset:offset + batch_size]
+                    batches += 1
+
+                    try:
+                        self.statement_cache.executemany(cursor, insert_sql, batch)
+                        connection.commit()
+                        rows_inserted += len(batch)
+                        continue
+                    except Exception as batch_error:
+                        connection.rollback()
+                        self.logger.warning(
+                            f"Batch insert of {len(batch)} rows failed, retrying row by row: {str(batch_error)}")
+
+                    for values in batch:
+                        try:
+                            self.statement_cache.execute(cursor, insert_sql, values)
+                            rows_inserted += 1
+                        except Exception as row_error:
+                            self.logger.warning(f"Error inserting row: {str(row_error)}")
+                    connection.commit()
+
+        return rows_inserted, batches
+
+    def _insert_stats(self, rows_inserted, batches, start):
+        """Build the throughput stats of an insert that started at start (perf_counter)."""
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        rows_per_sec = round(rows_inserted / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else float(rows_inserted)
+
+        return {
+            'rows_inserted': rows_inserted,
+            'batches': batches,
+            'elapsed_ms': elapsed_ms,
+            'rows_per_sec': rows_per_sec,
+            'statement_cache_hit_rate': self.statement_cache.get_metrics()['hit_rate']
+        }
+
+    def load_frame(self, df, schema_name, table_name, batch_size=None, connection=None):
+        """
+        Bulk-load a frame whose columns are named like the target table's columns.
+
+        Used for generated or extracted tables (e.g. ACDOCA) rather than Bloomberg
+        responses. Columns are converted vectorized and streamed to HANA as
+        executemany array binds, committing per batch, so only one batch of bind
+        rows is materialized at a time.
+
+        Args:
+            df (DataFrame): Rows to load; columns not in the table are ignored
+            schema_name (str): The schema name in SAP HANA
+            table_name (str): The table name to load into
+            batch_size (int): Rows per executemany call (defaults to insert_batch_size)
+            connection: Connection to load on, e.g. a pooled connection for
+                parallel loads (defaults to the primary connection)
+
+        Returns:
+            int: The number of rows loaded
+        """
+        connection = connection or self.connection
+        if not connection:
+            self.logger.error("No connection to SAP HANA. Cannot load data.")
             return 0
 
-    def _extract_value(self, row, field_name):
+        batch_size = max(1, int(batch_size or self.insert_batch_size))
+        rows_loaded = 0
+        cursor = None
+
+        try:
+            cursor = connection.cursor()
+
+            metadata = self._get_table_metadata(cursor, schema_name, table_name)
+            if metadata is None:
+                self.logger.error(f'Table "{schema_name}"."{table_name}" does not exist')
+                return 0
+
+            columns = [c for c in df.columns if c in metadata['types'] and c != 'ID']
+            insert_sql = self._build_insert_sql(schema_name, table_name, columns)
+            insert_cursor = self.statement_cache.get(connection, insert_sql)
+
+            with self._manual_commit(connection):
+                for offset in range(0, len(df), batch_size):
+                    chunk = df.iloc[offset:offset + batch_size]
+                    column_values = [
+                        self._series_values(chunk[column], metadata['coercers'].get(column))
+                        for column in columns
+                    ]
+                    self.statement_cache.executemany(insert_cursor, insert_sql, list(zip(*column_values)))
+                    connection.commit()
+                    rows_loaded += len(chunk)
+
+            return rows_loaded
+
+        except Exception as e:
+            connection.rollback()
+            self.logger.error(
+                f'Error loading data into "{schema_name}"."{table_name}" '
+                f'after {rows_loaded} rows: {str(e)}')
+            return rows_loaded
+        finally:
+            if cursor:
+                cursor.close()
+
+    # ========== STREAMING INGESTION ==========
+
+    def ingest_stream(self, chunks, schema_name, table_name, batch_size=None,
+                      dedup=True, queue_size=2, connection=None):
         """
-        Helper method to extract field values from Bloomberg data.
+        Ingest an iterable of response frames chunk by chunk.
+
+        Stages run as a pipeline: a fetch thread pulls chunks from the source
+        (typically a generator doing the Bloomberg requests), a prepare thread
+        extracts, coerces and de-duplicates them, and the calling thread sends
+        the batches to HANA. Stages hand over through queues of queue_size
+        chunks, so memory stays bounded by the chunk size while network I/O on
+        the fetch side overlaps with insert round trips.
+
+        Throughput and per-stage timings are returned in the result (not kept
+        on the client, as streams may run concurrently); pass
+        result["hana_insert"] to log_ingestion_end as insert_stats.
 
         Args:
-            row: DataFrame row
-            field_name: Field name to extract
+            chunks (iterable): DataFrames in the Bloomberg response format
+            schema_name (str): The schema name in SAP HANA
+            table_name (str): The table name to insert into
+            batch_size (int): Rows per executemany call (defaults to insert_batch_size)
+            dedup (bool): Skip rows repeated within a chunk or already present in
+                the table (which covers rows from earlier chunks)
+            queue_size (int): Chunks buffered between stages
+            connection: Connection to load on, e.g. a pooled connection for
+                parallel loads (defaults to the primary connection)
 
         Returns:
-            Value or None if not found
+            dict: records_fetched, records_inserted, records_skipped, chunks,
+                stage_ms and hana_insert (throughput stats including stage_ms);
+                error holds the message if the run stopped early
         """
-        # Direct access
-        if field_name in row:
-            return row[field_name]
+        result = {
+            'records_fetched': 0,
+            'records_inserted': 0,
+            'records_skipped': 0,
+            'chunks': 0,
+            'stage_ms': {stage: 0.0 for stage in ('fetch', 'extract', 'coerce', 'dedup', 'insert')}
+        }
 
-        # Try with case-insensitive lookup
-        for key in row.keys():
-            if key.upper() == field_name.upper():
-                return row[key]
+        connection = connection or self.connection
+        if not connection:
+            self.logger.error("No connection to SAP HANA. Cannot insert data.")
+            result['error'] = "No connection to SAP HANA"
+            return result
+
+        batch_size = max(1, int(batch_size or self.insert_batch_size))
+        stage_ms = result['stage_ms']
+        fetched = queue.Queue(maxsize=max(1, queue_size))
+        prepared = queue.Queue(maxsize=max(1, queue_size))
+        stop = threading.Event()
+        start = time.perf_counter()
+        timestamp = datetime.datetime.now()
+        batches = 0
+        cursor = None
+
+        def put(target, item):
+            # Give up when the consumer has stopped instead of blocking forever
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source):
+            # Treat a stopped pipeline as the end of the stream
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _STREAM_END
+
+        def fetch_stage():
+            try:
+                iterator = iter(chunks)
+                while not stop.is_set():
+                    stage_start = time.perf_counter()
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        break
+                    stage_ms['fetch'] += (time.perf_counter() - stage_start) * 1000
+                    if not put(fetched, chunk):
+                        return
+            except Exception as e:
+                put(fetched, e)
+            put(fetched, _STREAM_END)
+
+        def prepare_stage():
+            while True:
+                chunk = get(fetched)
+                if chunk is _STREAM_END or isinstance(chunk, Exception):
+                    put(prepared, chunk)
+                    return
+                try:
+                    put(prepared, self._prepare_stream_chunk(
+                        chunk, columns, coercers, timestamp, dedup, stage_ms))
+                except Exception as e:
+                    put(prepared, e)
+                    return
+
+        try:
+            cursor = connection.cursor()
+            metadata = self._get_table_metadata(cursor, schema_name, table_name)
+            columns = self._get_table_columns(cursor, schema_name, table_name)
+            coercers = metadata['coercers'] if metadata else {}
+            stage_columns = [c for c in columns if c not in NON_BUSINESS_COLUMNS]
+            if 'ROW_HASH' in columns:
+                stage_columns.append('ROW_HASH')
+
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix='hana-ingest') as executor:
+                executor.submit(fetch_stage)
+                executor.submit(prepare_stage)
+
+                try:
+                    while True:
+                        item = prepared.get()
+                        if item is _STREAM_END:
+                            break
+                        if isinstance(item, Exception):
+                            raise item
+
+                        row_count, rows = item
+                        stage_start = time.perf_counter()
+                        if dedup:
+                            inserted = self._merge_staged_rows(
+                                cursor, schema_name, table_name, stage_columns, rows,
+                                timestamp, batch_size, connection) if rows else 0
+                            batches += (len(rows) + batch_size - 1) // batch_size
+                        else:
+                            inserted, chunk_batches = self._execute_insert_batches(
+                                schema_name, table_name, rows, batch_size, connection)
+                            batches += chunk_batches
+                        stage_ms['insert'] += (time.perf_counter() - stage_start) * 1000
+
+                        result['chunks'] += 1
+                        result['records_fetched'] += row_count
+                        result['records_inserted'] += inserted
+                        result['records_skipped'] += row_count - inserted
+                finally:
+                    stop.set()
+
+        except Exception as e:
+            connection.rollback()
+            self.logger.error(f"Error in streaming ingestion into HANA: {str(e)}")
+            result['error'] = str(e)
+        finally:
+            if cursor:
+                cursor.close()
+
+        for stage in stage_ms:
+            stage_ms[stage] = int(stage_ms[stage])
+        result['hana_insert'] = self._insert_stats(result['records_inserted'], batches, start)
+        result['hana_insert']['stage_ms'] = dict(stage_ms)
+
+        self.logger.info(
+            f'Streamed {result["records_fetched"]} records in {result["chunks"]} chunks into '
+            f'"{schema_name}"."{table_name}": {result["records_inserted"]} inserted, '
+            f'{result["records_skipped"]} skipped (stage ms: {stage_ms})')
+        return result
+
+    def _prepare_stream_chunk(self, chunk, columns, coercers, timestamp, dedup, stage_ms):
+        """
+        Run the extract, coerce and dedup stages of ingest_stream on one chunk.
+
+        Duplicates are dropped within the chunk only, so memory stays bounded
+        by the chunk size; rows repeated from earlier chunks are rejected by
+        the anti-join in _merge_staged_rows, as those chunks are committed.
+
+        Args:
+            chunk (DataFrame): Response frame chunk
+            columns (list): Target table columns
+            coercers (dict): Column name -> type converter from the metadata cache
+            timestamp (datetime): INSERTED_AT value for this load
+            dedup (bool): Drop rows whose ROW_HASH repeats within the chunk
+            stage_ms (dict): Stage timings to add to
+
+        Returns:
+            tuple: (rows in chunk, rows) where rows are value lists in staging
+                column order when dedup is on, else grouped by column signature
+        """
+        stage_start = time.perf_counter()
+        extracted = self._extract_frame(chunk, columns, {})
+        stage_ms['extract'] += (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        for column, values in extracted.items():
+            if coercers.get(column) is not None:
+                extracted[column] = self._series_values(pd.Series(values, dtype=object), coercers[column])
+        stage_ms['coerce'] += (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        row_count = len(chunk)
+        if dedup:
+            business_columns = [c for c in columns if c not in NON_BUSINESS_COLUMNS]
+            seen_hashes = set()
+            rows = []
+            for index in range(row_count):
+                values = [extracted[column][index] for column in business_columns]
+                row_hash = compute_row_hash(dict(zip(business_columns, values)), business_columns)
+                if row_hash in seen_hashes:
+                    continue
+                seen_hashes.add(row_hash)
+                if 'ROW_HASH' in columns:
+                    values.append(row_hash)
+                rows.append(values)
+        else:
+            signature = self._insert_signature(extracted, columns)
+            rows = {signature: [
+                self._build_insert_row(extracted, index, signature, columns, timestamp)
+                for index in range(row_count)
+            ]} if row_count else {}
+        stage_ms['dedup'] += (time.perf_counter() - stage_start) * 1000
+
+        return row_count, rows
+
+    def ingest_tables(self, sources, run_id, schema_name=None, triggered_by='MANUAL',
+                      data_source='BLOOMBERG_MULTI_TABLE', max_workers=None, batch_size=None,
+                      dedup=True):
+        """
+        Ingest several tables concurrently, each on its own pooled connection.
 
-        # Try nested dictionaries (common in Bloomberg responses)
-        if 'data' in row and isinstance(row['data'], dict):
-            for key in row['data'].keys():
-                if key.upper() == field_name.upper():
-                    return row['data'][key]
+        Every table is loaded through ingest_stream as a sub-run logged in
+        INGESTION_LOGS under "<run_id>/<n>" with the table name as DATA_SOURCE;
+        the parent run aggregates their counts and lists them in its
+        EXECUTION_DETAILS. With enough workers the wall-clock time approaches
+        that of the slowest table instead of the sum of all tables.
 
-        # Try looking in a 'fields' or 'values' dictionary
-        for container in ['fields', 'values', 'results']:
-            if container in row and isinstance(row[container], dict):
-                for key in row[container].keys():
-                    if key.upper() == field_name.upper():
-                        return row[container][key]
+        Args:
+            sources (dict): Table name -> DataFrame or iterable of DataFrame chunks
+            run_id (str): Unique identifier of the parent ingestion run
+            schema_name (str): Target schema (defaults to the configured schema)
+            triggered_by (str): How the ingestion was triggered (MANUAL, SCHEDULED, API)
+            data_source (str): Data source identifier of the parent run
+            max_workers (int): Tables loaded at once (defaults to ingest_max_workers,
+                capped by the pool size; 1 without a pool)
+            batch_size (int): Rows per executemany call (defaults to insert_batch_size)
+            dedup (bool): Skip rows already present in the target tables
 
-        # Not found
-        return None
+        Returns:
+            dict: Table name -> ingest_stream result with run_id, status and elapsed_ms added
+        """
+        if not self.connection:
+            self.logger.error("No connection to SAP HANA. Cannot ingest tables.")
+            return {}
+
+        schema_name = schema_name or self.schema
+        batch_size = max(1, int(batch_size or self.insert_batch_size))
+        max_workers = max(1, int(max_workers or self.ingest_max_workers))
+        # Without a pool every table would share the primary connection
+        max_workers = min(max_workers, self.pool.max_size) if self.pool else 1
+
+        start = time.perf_counter()
+        self.log_ingestion_start(run_id, triggered_by, data_source)
+
+        sub_runs = {}
+        for number, table_name in enumerate(sources, start=1):
+            sub_runs[table_name] = f"{run_id}{SUB_RUN_SEPARATOR}{number}"
+            self.log_ingestion_start(sub_runs[table_name], triggered_by, table_name)
+
+        def load_table(table_name):
+            table_start = time.perf_counter()
+            chunks = sources[table_name]
+            if isinstance(chunks, pd.DataFrame):
+                chunks = iter_frame_chunks(chunks, batch_size)
+
+            with self.pooled_connection() as connection:
+                result = self.ingest_stream(chunks, schema_name, table_name, batch_size=batch_size,
+                                            dedup=dedup, connection=connection)
+            result['elapsed_ms'] = int((time.perf_counter() - table_start) * 1000)
+            return result
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hana-tables') as executor:
+            futures = {executor.submit(load_table, table_name): table_name for table_name in sources}
+
+            # Sub-runs are closed as their tables finish, from this thread's connection
+            for future in as_completed(futures):
+                table_name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'records_fetched': 0, 'records_inserted': 0, 'records_skipped': 0,
+                              'chunks': 0, 'stage_ms': {}, 'elapsed_ms': 0, 'error': str(e)}
+
+                result['run_id'] = sub_runs[table_name]
+                if 'error' not in result:
+                    result['status'] = 'SUCCESS'
+                else:
+                    result['status'] = 'PARTIAL' if result['records_inserted'] else 'FAILED'
+                results[table_name] = result
+
+                self.log_ingestion_end(
+                    result['run_id'], result['status'], result['records_fetched'],
+                    result['records_inserted'], error_message=result.get('error'),
+                    api_time_ms=result['stage_ms'].get('fetch', 0),
+                    hana_time_ms=result['elapsed_ms'],
+                    execution_details={
+                        'parent_run_id': run_id,
+                        'table': table_name,
+                        'records_skipped': result['records_skipped'],
+                        'chunks': result['chunks'],
+                        'stage_ms': result['stage_ms']
+                    },
+                    insert_stats=result.get('hana_insert'))
+
+        statuses = {result['status'] for result in results.values()}
+        if statuses == {'SUCCESS'}:
+            status = 'SUCCESS'
+        elif statuses == {'FAILED'}:
+            status = 'FAILED'
+        else:
+            status = 'PARTIAL'
+
+        records_fetched = sum(r['records_fetched'] for r in results.values())
+        records_inserted = sum(r['records_inserted'] for r in results.values())
+        wall_ms = int((time.perf_counter() - start) * 1000)
+
+        errors = [f"{table}: {r['error']}" for table, r in results.items() if 'error' in r]
+        self.log_ingestion_end(
+            run_id, status, records_fetched, records_inserted,
+            error_message="; ".join(errors)[:5000] if errors else None,
+            hana_time_ms=wall_ms,
+            execution_details={
+                'max_workers': max_workers,
+                'sum_table_ms': sum(r['elapsed_ms'] for r in results.values()),
+                'sub_runs': [
+                    {'run_id': r['run_id'], 'table': table, 'status': r['status'],
+                     'records_inserted': r['records_inserted'], 'elapsed_ms': r['elapsed_ms']}
+                    for table, r in results.items()
+                ]
+            })
+
+        self.logger.info(
+            f"Ingested {len(results)} tables in {wall_ms} ms with {max_workers} workers "
+            f"({records_inserted} rows inserted, status {status})")
+        return results
 
     # ========== INGESTION LOGGING METHODS ==========
 
@@ -516,7 +1851,7 @@ class HanaClient:
 
     def log_ingestion_end(self, run_id, status, records_fetched, records_inserted,
                           records_failed=0, error_message=None, api_time_ms=0,
-                          hana_time_ms=0, execution_details=None):
+                          hana_time_ms=0, execution_details=None, insert_stats=None):
         """
         Log the end of an ingestion run with results.
 
@@ -528,8 +1863,12 @@ class HanaClient:
             records_failed (int): Number of records that failed to insert
             error_message (str): Error message if any
             api_time_ms (int): Bloomberg API response time in milliseconds
-            hana_time_ms (int): HANA insert time in milliseconds
+            hana_time_ms (int): HANA insert time in milliseconds (defaults to the
+                elapsed time of insert_stats when not given)
             execution_details (dict): Additional execution details as JSON
+            insert_stats (dict): Throughput stats of this run's insert (e.g. from
+                insert_data(..., return_stats=True)); added under "hana_insert",
+                with streaming stage timings under "stage_ms"
 
         Returns:
             bool: True if successful, False otherwise
@@ -542,6 +1881,15 @@ class HanaClient:
             cursor = self.connection.cursor()
             end_time = datetime.datetime.now()
 
+            # Report throughput of this run's insert alongside the timing
+            if insert_stats:
+                if not hana_time_ms:
+                    hana_time_ms = insert_stats['elapsed_ms']
+                execution_details = dict(execution_details or {})
+                execution_details.setdefault('hana_insert', insert_stats)
+                if 'stage_ms' in insert_stats:
+                    execution_details.setdefault('stage_ms', insert_stats['stage_ms'])
+
             # Convert execution details to JSON string
             details_json = json.dumps(execution_details) if execution_details else None
 
@@ -568,15 +1916,66 @@ class HanaClient:
             cursor.close()
 
             self.logger.info(f"Logged ingestion end for run_id: {run_id} with status: {status}")
+
+            if status in ('SUCCESS', 'PARTIAL'):
+                self._notify_ingestion_listeners(run_id)
             return True
 
         except Exception as e:
             self.logger.error(f"Error logging ingestion end: {str(e)}")
             return False
 
+    def add_ingestion_listener(self, callback):
+        """
+        Register a callback run when log_ingestion_end records new data.
+
+        Used by services to drop cached results as soon as an ingestion run
+        in this process lands (other processes notice via get_ingestion_watermark).
+
+        Args:
+            callback (callable): Called with the run_id of the finished run
+        """
+        self._ingestion_listeners.append(callback)
+
+    def _notify_ingestion_listeners(self, run_id):
+        """Run the ingestion listeners, logging instead of raising their errors."""
+        for callback in list(self._ingestion_listeners):
+            try:
+                callback(run_id)
+            except Exception as e:
+                self.logger.warning(f"Ingestion listener failed for run_id {run_id}: {str(e)}")
+
+    def get_ingestion_watermark(self):
+        """
+        Get a cheap marker of the last successful ingestion.
+
+        Returns:
+            tuple: (successful run count, latest END_TIME) or None if unavailable
+        """
+        if not self.connection:
+            return None
+
+        cursor = None
+        try:
+            cursor = self.cursor()
+            cursor.execute(f"""
+            SELECT COUNT(*), MAX("END_TIME")
+            FROM "{self.schema}"."INGESTION_LOGS"
+            WHERE "STATUS" IN ('SUCCESS', 'PARTIAL')
+            """)
+            row = cursor.fetchone()
+            return (row[0], str(row[1]) if row[1] else None) if row else None
+
+        except Exception as e:
+            self.logger.warning(f"Error reading ingestion watermark: {str(e)}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+
     def get_last_ingestion_status(self):
         """
-        Get the status of the last ingestion run.
+        Get the status of the last ingestion run (per-table sub-runs are not counted).
 
         Returns:
             dict: Dictionary containing last ingestion details or None
@@ -601,11 +2000,12 @@ class HanaClient:
                 "TRIGGERED_BY",
                 "DATA_SOURCE"
             FROM "{self.schema}"."INGESTION_LOGS"
+            WHERE "RUN_ID" NOT LIKE ?
             ORDER BY "START_TIME" DESC
             LIMIT 1
             """
 
-            cursor.execute(query)
+            cursor.execute(query, [f"%{SUB_RUN_SEPARATOR}%"])
             row = cursor.fetchone()
             cursor.close()
 
@@ -629,12 +2029,13 @@ class HanaClient:
             self.logger.error(f"Error getting last ingestion status: {str(e)}")
             return None
 
-    def get_ingestion_history(self, limit=10):
+    def get_ingestion_history(self, limit=10, include_sub_runs=False):
         """
         Get the history of ingestion runs.
 
         Args:
             limit (int): Number of records to retrieve
+            include_sub_runs (bool): Also list the per-table sub-runs of multi-table runs
 
         Returns:
             list: List of dictionaries containing ingestion history
@@ -658,11 +2059,12 @@ class HanaClient:
                 "TRIGGERED_BY",
                 "DATA_SOURCE"
             FROM "{self.schema}"."INGESTION_LOGS"
+            {"" if include_sub_runs else 'WHERE "RUN_ID" NOT LIKE ?'}
             ORDER BY "START_TIME" DESC
             LIMIT {limit}
             """
 
-            cursor.execute(query)
+            cursor.execute(query, [] if include_sub_runs else [f"%{SUB_RUN_SEPARATOR}%"])
             rows = cursor.fetchall()
             cursor.close()
 
@@ -764,114 +2166,272 @@ class HanaClient:
             self.logger.error(f"Error getting total records: {str(e)}")
             return 0
 
-    def insert_data_with_duplicate_check(self, df, schema_name, table_name):
+    def insert_data_with_duplicate_check(self, df, schema_name, table_name, batch_size=None):
         """
         Insert data from DataFrame to SAP HANA table with duplicate checking.
         Skips exact duplicate rows.
 
+        Duplicates are resolved set-based: the batch is de-duplicated in memory,
+        bulk-loaded into a session-local staging table and moved into the target
+        with a single anti-join INSERT ... SELECT, so the number of statements
+        does not grow with the number of rows.
+
         Args:
             df (DataFrame): The pandas DataFrame containing Bloomberg data
             schema_name (str): The schema name in SAP HANA
             table_name (str): The table name to insert into
+            batch_size (int): Rows per executemany call into the staging table
 
         Returns:
-            tuple: (rows_inserted, rows_skipped)
+            tuple: (rows_inserted, rows_skipped, new_entries)
         """
         if not self.connection:
             self.logger.error("No connection to SAP HANA. Cannot insert data.")
-            return 0, 0
+            return 0, 0, 0
+
+        batch_size = max(1, int(batch_size or self.insert_batch_size))
+        cursor = None
 
         try:
             cursor = self.connection.cursor()
-            rows_inserted = 0
-            rows_skipped = 0
+            start = time.perf_counter()
             timestamp = datetime.datetime.now()
 
-            # Get column metadata for the table
-            cursor.execute("""
-            SELECT COLUMN_NAME FROM SYS.TABLE_COLUMNS
-            WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
-            AND COLUMN_NAME != 'ID'
-            ORDER BY POSITION
-            """, [schema_name, table_name])
+            metadata = self._get_table_metadata(cursor, schema_name, table_name)
+            columns = self._get_table_columns(cursor, schema_name, table_name)
+            coercers = metadata['coercers'] if metadata else {}
+            business_columns = [c for c in columns if c not in NON_BUSINESS_COLUMNS]
+            has_row_hash = 'ROW_HASH' in columns
 
-            columns = [row[0] for row in cursor.fetchall()]
+            extracted = self._extract_frame(df, columns, coercers)
 
-            # Get count before insertion
-            count_before = self.get_total_records(schema_name, table_name)
+            # Hash the incoming rows and drop duplicates within the batch itself
+            staged_rows = {}
+            for index in range(len(df)):
+                values = [extracted[column][index] for column in business_columns]
+                row_hash = compute_row_hash(dict(zip(business_columns, values)), business_columns)
+                if has_row_hash:
+                    values.append(row_hash)
+                staged_rows.setdefault(row_hash, values)
 
-            # Process the Bloomberg API response DataFrame
-            for index, row in df.iterrows():
-                try:
-                    # Extract identifier info
-                    ticker = row.get('ticker', '')
-                    identifier_type = row.get('identifierType', '')
-                    identifier_value = row.get('identifierValue', '')
-
-                    # Build row data dictionary for duplicate check
-                    row_data = {
-                        'TICKER': ticker,
-                        'IDENTIFIER_TYPE': identifier_type,
-                        'IDENTIFIER_VALUE': identifier_value
-                    }
-
-                    # Add available data fields to row_data
-                    for column in columns:
-                        if column not in ['TICKER', 'IDENTIFIER_TYPE', 'IDENTIFIER_VALUE', 'TIMESTAMP']:
-                            field_value = self._extract_value(row, column)
-                            row_data[column] = field_value
-
-                    # Check for duplicate
-                    if self.check_duplicate(row_data, schema_name, table_name):
-                        rows_skipped += 1
-                        self.logger.debug(f"Skipping duplicate record for {ticker}")
-                        continue
-
-                    # Build the insert SQL dynamically based on available columns
-                    column_names = []
-                    placeholders = []
-                    values = []
-
-                    # Always add the common columns
-                    column_names.extend(['"TICKER"', '"IDENTIFIER_TYPE"', '"IDENTIFIER_VALUE"', '"INSERTED_AT"'])
-                    placeholders.extend(['?', '?', '?', '?'])
-                    values.extend([ticker, identifier_type, identifier_value, timestamp])
-
-                    # Add available data fields
-                    for column in columns:
-                        if column not in ['TICKER', 'IDENTIFIER_TYPE', 'IDENTIFIER_VALUE', 'TIMESTAMP']:
-                            field_value = self._extract_value(row, column)
-
-                            if field_value is not None:
-                                column_names.append(f'"{column}"')
-                                placeholders.append('?')
-                                values.append(field_value)
-
-                    # Construct and execute SQL
-                    insert_sql = f"""
-                    INSERT INTO "{schema_name}"."{table_name}" (
-                        {", ".join(column_names)}
-                    ) VALUES ({", ".join(placeholders)})
-                    """
-
-                    cursor.execute(insert_sql, values)
-                    rows_inserted += 1
-
-                except Exception as row_error:
-                    self.logger.warning(f"Error inserting row {index}: {str(row_error)}")
-                    continue
+            rows_in_batch = len(df)
+            if not staged_rows:
+                return 0, rows_in_batch, 0
 
-            self.connection.commit()
-            cursor.close()
+            stage_columns = business_columns + (['ROW_HASH'] if has_row_hash else [])
+            rows = list(staged_rows.values())
+            rows_inserted = self._merge_staged_rows(
+                cursor, schema_name, table_name, stage_columns, rows, timestamp, batch_size)
+            rows_skipped = rows_in_batch - rows_inserted
 
-            # Get count after insertion
-            count_after = self.get_total_records(schema_name, table_name)
-            new_entries = count_after - count_before
+            self.last_insert_stats = self._insert_stats(
+                rows_inserted, (len(rows) + batch_size - 1) // batch_size, start)
+            self.logger.info(f'Inserted {rows_inserted} rows, skipped {rows_skipped} duplicates. New entries: {rows_inserted}')
 
-            self.logger.info(f'Inserted {rows_inserted} rows, skipped {rows_skipped} duplicates. New entries: {new_entries}')
-
-            return rows_inserted, rows_skipped, new_entries
+            return rows_inserted, rows_skipped, rows_inserted
 
         except Exception as e:
+            self.connection.rollback()
             self.logger.error(f"Error inserting data to HANA: {str(e)}")
             return 0, 0, 0
+        finally:
+            if cursor:
+                cursor.close()
+
+    def _merge_staged_rows(self, cursor, schema_name, table_name, stage_columns, rows, timestamp, batch_size,
+                           connection=None):
+        """
+        Move rows into a table through a staging table, skipping ones already present.
+
+        Args:
+            cursor: Open HANA cursor
+            schema_name (str): Schema name
+            table_name (str): Target table
+            stage_columns (list): Business columns of each row, plus ROW_HASH when
+                the target has it (always last)
+            rows (list): Value lists in stage_columns order
+            timestamp (datetime): INSERTED_AT value for the new rows (ignored when
+                the target has no INSERTED_AT column)
+            batch_size (int): Rows per executemany call into the staging table
+            connection: Connection the cursor belongs to (defaults to the primary connection)
+
+        Returns:
+            int: The number of rows inserted into the target
+        """
+        stage_table = f"#STAGE_{table_name}"
+        has_row_hash = stage_columns[-1] == 'ROW_HASH'
+        business_columns = stage_columns[:-1] if has_row_hash else stage_columns
+        # Not every table records its load time (e.g. ANNUAL_FINANCIALS_10K)
+        has_inserted_at = 'INSERTED_AT' in self._get_table_columns(cursor, schema_name, table_name)
+
+        self._create_staging_table(cursor, schema_name, table_name, stage_table, stage_columns)
+
+        stage_sql = self._build_insert_sql(None, stage_table, stage_columns)
+        for offset in range(0, len(rows), batch_size):
+            cursor.executemany(stage_sql, rows[offset:offset + batch_size])
+
+        # One anti-join moves only rows not already present in the target:
+        # an indexed ROW_HASH lookup when available, else a match on every column
+        column_list = ", ".join(f'"{c}"' for c in stage_columns)
+        if has_row_hash:
+            match_clause = 'T."ROW_HASH" = S."ROW_HASH"'
+        else:
+            match_clause = " AND ".join(
+                f'(T."{c}" = S."{c}" OR (T."{c}" IS NULL AND S."{c}" IS NULL))'
+                for c in business_columns
+            )
+        select_list = ", ".join(f'S."{c}"' for c in stage_columns)
+        params = []
+        if has_inserted_at:
+            column_list += ', "INSERTED_AT"'
+            select_list += ', ?'
+            params.append(timestamp)
+        cursor.execute(f"""
+        INSERT INTO "{schema_name}"."{table_name}" ({column_list})
+        SELECT {select_list}
+        FROM "{stage_table}" S
+        WHERE NOT EXISTS (
+            SELECT 1 FROM "{schema_name}"."{table_name}" T
+            WHERE {match_clause}
+        )
+        """, params)
+
+        rows_inserted = max(cursor.rowcount, 0)
+
+        cursor.execute(f'DROP TABLE "{stage_table}"')
+        (connection or self.connection).commit()
+
+        return rows_inserted
+
+    def _create_staging_table(self, cursor, schema_name, table_name, stage_table, columns):
+        """
+        Create an empty session-local staging table shaped like the target columns.
+
+        Args:
+            cursor: Open HANA cursor
+            schema_name (str): Schema of the target table
+            table_name (str): Target table
+            stage_table (str): Local temporary table name (must start with '#')
+            columns (list): Columns to copy
+        """
+        try:
+            cursor.execute(f'DROP TABLE "{stage_table}"')
+        except Exception:
+            pass  # Not left over from an earlier run in this session
+
+        cursor.execute(f"""
+        CREATE LOCAL TEMPORARY COLUMN TABLE "{stage_table}" AS (
+            SELECT {", ".join(f'"{c}"' for c in columns)}
+            FROM "{schema_name}"."{table_name}"
+        ) WITH NO DATA
+        """)
+
+    def _create_row_hash_index(self, cursor, schema_name, table_name):
+        """
+        Create the unique ROW_HASH index of a table if it does not exist yet.
+
+        Args:
+            cursor: Open HANA cursor
+            schema_name (str): Schema name
+            table_name (str): Table name
+        """
+        index_name = f"IDX_{table_name}_ROW_HASH"
+
+        cursor.execute("""
+        SELECT COUNT(*) FROM SYS.INDEXES
+        WHERE SCHEMA_NAME = ? AND INDEX_NAME = ?
+        """, [schema_name, index_name])
+
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f'''
+            CREATE UNIQUE INDEX "{schema_name}"."{index_name}"
+            ON "{schema_name}"."{table_name}" ("ROW_HASH")
+            ''')
+            self.logger.info(f'Created unique index "{index_name}" on "{schema_name}"."{table_name}"')
+
+    def backfill_row_hashes(self, schema_name, table_name, chunk_size=5000):
+        """
+        One-off migration: add ROW_HASH to an existing table, hash its rows and index it.
+
+        Rows are walked in ID order in chunks. When several existing rows share
+        the same content only the first keeps a hash; the others are left NULL
+        and reported as duplicates so the unique index can still be built.
+
+        Args:
+            schema_name (str): Schema name
+            table_name (str): Table name
+            chunk_size (int): Rows read and updated per round trip
+
+        Returns:
+            dict: Counts of hashed and duplicate rows, or None on failure
+        """
+        if not self.connection:
+            self.logger.error("No connection to SAP HANA. Cannot backfill row hashes.")
+            return None
+
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+
+            columns = self._get_table_columns(cursor, schema_name, table_name)
+            if 'ROW_HASH' not in columns:
+                cursor.execute(f'ALTER TABLE "{schema_name}"."{table_name}" ADD ("ROW_HASH" NVARCHAR(64))')
+                self.connection.commit()
+                self.invalidate_table_metadata(schema_name, table_name)
+                self.logger.info(f'Added ROW_HASH column to "{schema_name}"."{table_name}"')
+
+            business_columns = [c for c in columns if c not in NON_BUSINESS_COLUMNS]
+            select_list = ", ".join(f'"{c}"' for c in business_columns)
+
+            # Hashes already assigned (e.g. by ingestion since the column was added)
+            cursor.execute(f'SELECT "ROW_HASH" FROM "{schema_name}"."{table_name}" WHERE "ROW_HASH" IS NOT NULL')
+            seen_hashes = {row[0] for row in cursor.fetchall()}
+
+            hashed = 0
+            duplicates = 0
+            last_id = -1
+
+            while True:
+                cursor.execute(f"""
+                SELECT "ID", {select_list}
+                FROM "{schema_name}"."{table_name}"
+                WHERE "ROW_HASH" IS NULL AND "ID" > ?
+                ORDER BY "ID"
+                LIMIT {int(chunk_size)}
+                """, [last_id])
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+
+                updates = []
+                for row in rows:
+                    row_hash = compute_row_hash(dict(zip(business_columns, row[1:])), business_columns)
+                    if row_hash in seen_hashes:
+                        duplicates += 1
+                        continue
+                    seen_hashes.add(row_hash)
+                    updates.append([row_hash, row[0]])
+
+                if updates:
+                    cursor.executemany(f'''
+                    UPDATE "{schema_name}"."{table_name}" SET "ROW_HASH" = ? WHERE "ID" = ?
+                    ''', updates)
+                self.connection.commit()
+
+                hashed += len(updates)
+                last_id = rows[-1][0]
+                self.logger.info(f"Backfilled {hashed} row hashes so far ({duplicates} duplicates)")
+
+            self._create_row_hash_index(cursor, schema_name, table_name)
+
+            self.logger.info(
+                f'Row hash backfill of "{schema_name}"."{table_name}" complete: '
+                f'{hashed} hashed, {duplicates} duplicates left without hash')
+            return {'hashed': hashed, 'duplicates': duplicates}
+
+        except Exception as e:
+            self.logger.error(f"Error backfilling row hashes: {str(e)}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
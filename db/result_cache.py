@@ -0,0 +1,647 @@
+"""
+Bounded in-memory result cache for the dashboard data services
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+def estimate_size(value):
+    """
+    Estimate the memory held by a cached value in bytes.
+
+    DataFrames and Series are measured with memory_usage(deep=True); dicts,
+    lists and tuples are summed over their items.
+
+    Args:
+        value: Cached value
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    """One in-flight call that concurrent callers wait on."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for it and share its result (or exception) instead of
+    repeating the work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}  # key -> _Flight
+        self._stats = {'calls': 0, 'executions': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """
+        Run fn for key unless a call for the same key is already in flight.
+
+        Args:
+            key: Identifies identical calls
+            fn (callable): Produces the result
+
+        Returns:
+            The result of fn, shared by all coalesced callers
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._stats['executions'] += 1
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def do_many(self, keys, fn):
+        """
+        Run fn once for the keys no call is in flight for, sharing the others.
+
+        Coalescing is per key: a caller whose keys overlap a running call
+        waits for that call's results for the overlapping keys and runs fn
+        only for the rest.
+
+        Args:
+            keys (list): Distinct keys to produce
+            fn (callable): Takes the list of keys this caller leads and
+                returns a dict of key -> result (None or a missing key means
+                no result)
+
+        Returns:
+            dict: key -> result (None for keys without a result)
+        """
+        led = {}
+        followed = {}
+        with self._lock:
+            self._stats['calls'] += 1
+            for key in keys:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = _Flight()
+                    self._flights[key] = flight
+                    led[key] = flight
+                else:
+                    followed[key] = flight
+            if led:
+                self._stats['executions'] += 1
+            if followed:
+                self._stats['coalesced'] += 1
+
+        results = {}
+        if led:
+            try:
+                produced = fn(list(led)) or {}
+                for key, flight in led.items():
+                    flight.result = results[key] = produced.get(key)
+            except Exception as e:
+                for flight in led.values():
+                    flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    for key in led:
+                        del self._flights[key]
+                for flight in led.values():
+                    flight.done.set()
+
+        for key, flight in followed.items():
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            results[key] = flight.result
+
+        return results
+
+    def get_stats(self):
+        """
+        Get coalescing counters.
+
+        Returns:
+            dict: calls, executions, coalesced and in_flight
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._flights)
+        return stats
+
+
+class _CacheEntry:
+    """A cached value with its freshness bounds and access count."""
+
+    __slots__ = ('value', 'size', 'ttl', 'expires_at', 'stale_until', 'loader', 'hits')
+
+    def __init__(self, value, size, ttl, expires_at, stale_until, loader):
+        self.value = value
+        self.size = size
+        self.ttl = ttl
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.loader = loader
+        self.hits = 0
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and an entry and byte budget.
+
+    Entries expire after their TTL; when either budget is exceeded the least
+    recently used entries are evicted. Hits, misses, expirations and
+    evictions are counted for get_stats().
+
+    With a watermark_fn the cache is also validated against the source data:
+    the watermark is polled at most every watermark_interval seconds on
+    reads, and when it moves every entry is invalidated, so entries can live
+    until new data lands instead of for a fixed TTL.
+
+    Concurrent get_or_load() misses for one key share a single load. Values
+    read through get_or_load() are also served stale-while-revalidate:
+    for up to max_stale seconds after expiry the old value is returned while a
+    background thread reloads it, and entries read at least hot_threshold
+    times are reloaded ahead of expiry once less than refresh_ahead of their
+    TTL remains.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, default_ttl=60,
+                 watermark_fn=None, watermark_interval=5, max_stale=0,
+                 refresh_ahead=0.2, hot_threshold=3, refresh_workers=2, shared=None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached entries
+            max_bytes (int): Maximum estimated size of all cached values
+            default_ttl (float): Seconds an entry lives when set() gets no ttl
+            watermark_fn (callable): Returns a value that changes when the cached
+                source data changes, or None when it cannot be determined
+            watermark_interval (float): Minimum seconds between watermark checks
+            max_stale (float): Seconds past expiry an entry may still be served
+                while it is refreshed (0 disables stale-while-revalidate)
+            refresh_ahead (float): Fraction of the TTL left at which hot entries
+                are refreshed in the background
+            hot_threshold (int): Reads since the last load that make an entry hot
+            refresh_workers (int): Background refresh threads
+            shared (CacheBackend): Optional cross-process store consulted before
+                loading, so other worker processes reuse each other's results
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.default_ttl = default_ttl
+
+        self.watermark_fn = watermark_fn
+        self.watermark_interval = watermark_interval
+
+        self.max_stale = max(0, max_stale)
+        self.refresh_ahead = refresh_ahead
+        self.hot_threshold = max(1, int(hot_threshold))
+        self.refresh_workers = max(1, int(refresh_workers))
+        self.shared = shared
+
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> _CacheEntry, least recently used first
+        self._bytes = 0
+        self._stats = {
+            'hits': 0, 'misses': 0, 'expirations': 0, 'evictions': 0, 'invalidations': 0,
+            'stale_hits': 0, 'refreshes': 0, 'refresh_ahead': 0, 'refresh_errors': 0,
+            'shared_hits': 0
+        }
+
+        # Bumped on every invalidation; set() drops values loaded under an older one
+        self._generation = 0
+        self._watermark = None
+        self._watermark_checked = float('-inf')
+        self._watermark_checking = False
+
+        # Keys being reloaded in the background and the threads doing it
+        self._refreshing = set()
+        self._executor = None
+
+        # Concurrent misses for the same key wait on one load
+        self._flight = SingleFlight()
+
+    @property
+    def generation(self):
+        """Invalidation counter to capture before loading a value for set()."""
+        return self._generation
+
+    def get(self, key):
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None when missing or expired
+        """
+        self._check_watermark()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self._stats['hits'] += 1
+            return entry.value
+
+    def get_or_load(self, key, loader, ttl=None):
+        """
+        Get a cached value, loading it on a miss and refreshing it in the background.
+
+        A fresh entry is returned as is (and refreshed ahead of expiry when hot);
+        an entry within max_stale of its expiry is returned while it is reloaded
+        in the background; anything older is loaded inline, once for all
+        concurrent callers of the key.
+
+        Args:
+            key: Cache key
+            loader (callable): Loads the value; returning None means "do not cache"
+            ttl (float): Seconds the entry stays fresh (defaults to default_ttl)
+
+        Returns:
+            The cached or loaded value (None if the loader returned None)
+        """
+        self._check_watermark()
+
+        with self._lock:
+            entry = self._lookup(key, time.monotonic())
+            if entry is not None:
+                return entry.value
+            generation = self._generation
+
+        def load():
+            value = self._load(key, loader, ttl)
+            if value is not None:
+                self.set(key, value, ttl=ttl, generation=generation, loader=loader)
+            return value
+
+        return self._flight.do(key, load)
+
+    def get_or_load_many(self, keys, loader, ttl=None):
+        """
+        Get several cached values, loading all the missing ones with one call.
+
+        Hits follow the same fresh/stale rules as get_or_load. Each loaded value
+        is cached under its own key with a single-key reload for background
+        refreshes, so later requests for any subset are served from the cache.
+        Concurrent callers are coalesced per key: a key already being loaded
+        by another call is waited for rather than loaded again.
+
+        Args:
+            keys (list): Cache keys
+            loader (callable): Takes the list of missing keys and returns a dict of
+                key -> value for them; a missing key or None value means "do not
+                cache", a None result that none could be loaded
+            ttl (float): Seconds the entries stay fresh (defaults to default_ttl)
+
+        Returns:
+            dict: key -> value for the keys that are cached or could be loaded
+                (keys the loader did not return are left out)
+        """
+        self._check_watermark()
+
+        results = {}
+        missing = []
+        with self._lock:
+            now = time.monotonic()
+            for key in dict.fromkeys(keys):
+                entry = self._lookup(key, now)
+                if entry is not None:
+                    results[key] = entry.value
+                else:
+                    missing.append(key)
+            generation = self._generation
+
+        if not missing:
+            return results
+
+        to_load = []
+        for key in missing:
+            shared_key = self._shared_key(key)
+            value = self.shared.get(shared_key) if shared_key is not None else None
+            if value is not None:
+                with self._lock:
+                    self._stats['shared_hits'] += 1
+                results[key] = value
+                self.set(key, value, ttl=ttl, generation=generation,
+                         loader=self._single_key_loader(key, loader))
+            else:
+                to_load.append(key)
+
+        def load(keys_to_load):
+            loaded = loader(keys_to_load) or {}
+            for key in keys_to_load:
+                value = loaded.get(key)
+                if value is not None:
+                    self.set(key, value, ttl=ttl, generation=generation,
+                             loader=self._single_key_loader(key, loader))
+                    self._publish(key, value, ttl)
+            return loaded
+
+        if to_load:
+            loaded = self._flight.do_many(to_load, load)
+            results.update((key, value) for key, value in loaded.items() if value is not None)
+
+        return results
+
+    def set(self, key, value, ttl=None, generation=None, loader=None):
+        """
+        Store a value, evicting least recently used entries to stay within budget.
+
+        Values larger than the whole byte budget are not cached.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl (float): Seconds the entry lives (defaults to default_ttl)
+            generation (int): The generation read before the value was loaded; the
+                value is dropped if the cache was invalidated in the meantime
+            loader (callable): Reloads the value for stale-while-revalidate
+        """
+        size = estimate_size(value)
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl
+        stale_until = expires_at + self.max_stale if loader is not None else expires_at
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.logger.debug(f"Not caching {key}: source data changed while it was loaded")
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            if size > self.max_bytes:
+                self.logger.debug(f"Not caching {key}: {size} bytes exceeds the cache budget")
+                return
+
+            self._entries[key] = _CacheEntry(value, size, ttl, expires_at, stale_until, loader)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key = next(iter(self._entries))
+                self._remove(evicted_key)
+                self._stats['evictions'] += 1
+                self.logger.debug(f"Evicted cache entry: {evicted_key}")
+
+    def delete(self, key):
+        """Remove one entry if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def invalidate(self):
+        """Drop every entry because the source data changed."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+            self._stats['invalidations'] += 1
+            # Adopt the new watermark on the next access without invalidating again
+            self._watermark = None
+            self._watermark_checked = float('-inf')
+        self.logger.debug("Result cache invalidated")
+
+    def _check_watermark(self):
+        """Poll watermark_fn if due and invalidate when the watermark moved."""
+        if self.watermark_fn is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if self._watermark_checking or now - self._watermark_checked < self.watermark_interval:
+                return
+            self._watermark_checking = True
+            generation = self._generation
+
+        # Query outside the lock; other readers keep being served meanwhile
+        watermark = None
+        try:
+            watermark = self.watermark_fn()
+        except Exception as e:
+            self.logger.warning(f"Could not read cache watermark: {str(e)}")
+
+        with self._lock:
+            self._watermark_checking = False
+            self._watermark_checked = time.monotonic()
+            if watermark is None:
+                return
+            moved = self._watermark is not None and watermark != self._watermark
+            self._watermark = watermark
+            if moved and generation == self._generation:
+                self._entries.clear()
+                self._bytes = 0
+                self._generation += 1
+                self._stats['invalidations'] += 1
+                self.logger.debug(f"Cache watermark moved to {watermark}, entries invalidated")
+
+    def get_stats(self):
+        """
+        Get cache counters and current usage.
+
+        Returns:
+            dict: hits (stale_hits of them served stale), misses, expirations,
+                evictions, invalidations, refreshes, refresh_ahead, refresh_errors,
+                shared_hits (loads answered by the shared store), coalesced (misses that waited on another caller's load), hit_rate,
+                entries and bytes
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        stats['coalesced'] = self._flight.get_stats()['coalesced']
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def close(self):
+        """Stop the background refresh threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _lookup(self, key, now):
+        """
+        Find a usable entry, updating statistics (call with the lock held).
+
+        Fresh entries may schedule a refresh-ahead, stale ones a background
+        reload; expired entries are removed.
+
+        Returns:
+            _CacheEntry: The entry to serve, or None on a miss
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            if now < entry.expires_at:
+                self._stats['hits'] += 1
+                entry.hits += 1
+                if (entry.hits >= self.hot_threshold and
+                        entry.expires_at - now < entry.ttl * self.refresh_ahead and
+                        self._schedule_refresh(key, entry)):
+                    self._stats['refresh_ahead'] += 1
+            elif now < entry.stale_until:
+                self._stats['hits'] += 1
+                self._stats['stale_hits'] += 1
+                self._schedule_refresh(key, entry)
+            else:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                entry = None
+
+        if entry is None:
+            self._stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def _schedule_refresh(self, key, entry):
+        """Reload an entry in the background unless that is already under way (call with the lock held)."""
+        if entry.loader is None or key in self._refreshing:
+            return False
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.refresh_workers, thread_name_prefix='cache-refresh')
+
+        self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, entry.loader, entry.ttl, self._generation)
+        return True
+
+    def _load(self, key, loader, ttl):
+        """Load a value from the shared store, else from loader (publishing it to the store)."""
+        shared_key = self._shared_key(key)
+        if shared_key is not None:
+            value = self.shared.get(shared_key)
+            if value is not None:
+                with self._lock:
+                    self._stats['shared_hits'] += 1
+                return value
+
+        value = loader()
+        if value is not None:
+            self._publish(key, value, ttl)
+        return value
+
+    def _publish(self, key, value, ttl):
+        """Store a freshly loaded value in the shared store, if one is used."""
+        shared_key = self._shared_key(key)
+        if shared_key is None:
+            return
+        try:
+            self.shared.set(shared_key, value, self.default_ttl if ttl is None else ttl)
+        except Exception as e:
+            self.logger.warning(f"Could not publish {key} to the shared cache: {str(e)}")
+
+    @staticmethod
+    def _single_key_loader(key, loader):
+        """Wrap a multi-key loader into the reload function of one entry."""
+        def load():
+            loaded = loader([key])
+            return None if loaded is None else loaded.get(key)
+        return load
+
+    def _shared_key(self, key):
+        """
+        Key of an entry in the shared store, or None when it must not be used.
+
+        With a watermark the key includes it, so results of older data are never
+        read back; until the watermark is known the shared store is skipped.
+        """
+        if self.shared is None:
+            return None
+        if self.watermark_fn is None:
+            return str(key)
+        watermark = self._watermark
+        return None if watermark is None else f"{watermark!r}|{key}"
+
+    def _refresh(self, key, loader, ttl, generation):
+        """
+        Background reload of one entry.
+
+        Always runs the loader: the shared copy was published with the same
+        TTL as the local one, so reading it back would just renew old data.
+        """
+        try:
+            value = loader()
+            if value is not None:
+                self._publish(key, value, ttl)
+                self.set(key, value, ttl=ttl, generation=generation, loader=loader)
+                with self._lock:
+                    self._stats['refreshes'] += 1
+        except Exception as e:
+            with self._lock:
+                self._stats['refresh_errors'] += 1
+            self.logger.warning(f"Background refresh of {key} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
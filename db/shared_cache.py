@@ -0,0 +1,345 @@
+"""
+Cache backends shared between the gunicorn worker processes
+"""
+
+import getpass
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from stat import S_ISDIR
+
+import numpy as np
+import pandas as pd
+
+# File layout: magic, 8-byte header length, pickled header, then 64-byte aligned column buffers
+_MAGIC = b'FDCACHE1'
+_ALIGN = 64
+
+# numpy dtype kinds stored as raw memory-mapped buffers (bool, ints, floats, complex, datetimes)
+_BUFFER_KINDS = 'biufcmM'
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class CacheBackend:
+    """
+    Interface of a cache shared between worker processes.
+
+    Keys are strings; values are DataFrames or picklable objects. A
+    Redis-compatible backend can replace FileCacheBackend by implementing
+    these methods.
+    """
+
+    def get(self, key):
+        """Return the value stored under key, or None when missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        """Store value under key for ttl seconds."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove key if present."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every key."""
+        raise NotImplementedError
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    Shared cache stored as files in a local directory.
+
+    Each entry is one file written to a temporary name and moved into place
+    with an atomic rename, so readers never see partial writes. Numeric and
+    datetime DataFrame columns are stored as raw buffers and read back as
+    copy-on-write memory maps: every worker reading an entry shares the same
+    page-cache pages until it modifies a column. Other columns and non-frame
+    values are pickled.
+
+    Headers are unpickled on read, so the directory must be private to the
+    user running the workers: it is created with mode 0700 and refused when
+    it is a symlink, owned by another user or writable by group or others.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, prune_interval=60):
+        """
+        Initialize the store, creating the directory if needed.
+
+        Args:
+            directory (str): Directory holding the cache files
+            max_bytes (int): Size above which the oldest files are removed
+            prune_interval (float): Minimum seconds between clean-ups of expired files
+
+        Raises:
+            PermissionError: If the directory is not private to the current user
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.max_bytes = max(1, int(max_bytes))
+        self.prune_interval = prune_interval
+
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        _check_private_directory(directory)
+
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    def get(self, key):
+        """
+        Read an entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The stored value, or None when missing, expired or unreadable
+        """
+        path = self._path(key)
+        try:
+            header, data_start = self._read_header(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Unreadable shared cache file {path}: {str(e)}")
+            return None
+
+        if header.get('key') != key:
+            return None
+        if header['expires_at'] <= time.time():
+            self._unlink(path)
+            return None
+
+        try:
+            return self._decode(path, header, data_start)
+        except Exception as e:
+            self.logger.warning(f"Error reading shared cache entry {key}: {str(e)}")
+            return None
+
+    def set(self, key, value, ttl):
+        """
+        Write an entry atomically.
+
+        Args:
+            key (str): Cache key
+            value: DataFrame or picklable object
+            ttl (float): Seconds the entry stays valid
+        """
+        header, buffers = self._encode(value)
+        header['key'] = key
+        header['expires_at'] = time.time() + ttl
+        header_bytes = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+        data_start = _aligned(len(_MAGIC) + 8 + len(header_bytes))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_MAGIC)
+                f.write(len(header_bytes).to_bytes(8, 'little'))
+                f.write(header_bytes)
+                for offset, buffer in buffers:
+                    f.seek(data_start + offset)
+                    f.write(buffer)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            self._unlink(tmp_path)
+            raise
+
+        self._maybe_prune()
+
+    def delete(self, key):
+        """Remove an entry if present."""
+        self._unlink(self._path(key))
+
+    def clear(self):
+        """Remove every entry."""
+        for name in os.listdir(self.directory):
+            if name.endswith('.cache'):
+                self._unlink(os.path.join(self.directory, name))
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest()[:40] + '.cache')
+
+    def _read_header(self, path):
+        """Read the header of a cache file; returns (header, data_start)."""
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError("not a cache file")
+            header_length = int.from_bytes(f.read(8), 'little')
+            header = pickle.loads(f.read(header_length))
+        return header, _aligned(len(_MAGIC) + 8 + header_length)
+
+    def _encode(self, value):
+        """
+        Split a value into a picklable header and raw column buffers.
+
+        Returns:
+            tuple: (header dict, list of (offset, buffer) relative to the data start)
+        """
+        if not isinstance(value, pd.DataFrame):
+            return {'kind': 'object', 'value': value}, []
+
+        columns = []
+        buffers = []
+        offset = 0
+        for position in range(value.shape[1]):
+            series = value.iloc[:, position]
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in _BUFFER_KINDS:
+                array = np.ascontiguousarray(series.to_numpy())
+                columns.append(('buffer', array.dtype.str, offset))
+                buffers.append((offset, array.tobytes()))
+                offset = _aligned(offset + array.nbytes)
+            else:
+                columns.append(('object', series.array))
+
+        return {
+            'kind': 'frame',
+            'rows': len(value),
+            'index': value.index,
+            'columns': value.columns,
+            'data': columns,
+        }, buffers
+
+    def _decode(self, path, header, data_start):
+        """Rebuild a value from its header, memory-mapping the column buffers."""
+        if header['kind'] == 'object':
+            return header['value']
+
+        rows = header['rows']
+        data = {}
+        for position, column in enumerate(header['data']):
+            if column[0] == 'object':
+                data[position] = column[1]
+            elif rows == 0:
+                data[position] = np.empty(0, dtype=np.dtype(column[1]))
+            else:
+                data[position] = np.memmap(path, dtype=np.dtype(column[1]), mode='c',
+                                           offset=data_start + column[2], shape=(rows,))
+
+        df = pd.DataFrame(data, index=header['index'], copy=False)
+        df.columns = header['columns']
+        return df
+
+    def _maybe_prune(self):
+        """Remove expired entries, then the oldest ones while over max_bytes."""
+        with self._lock:
+            if time.monotonic() - self._last_prune < self.prune_interval:
+                return
+            self._last_prune = time.monotonic()
+
+        now = time.time()
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if name.endswith('.tmp'):
+                    # Left behind by a worker that died mid-write
+                    if now - stat.st_mtime > 600:
+                        self._unlink(path)
+                    continue
+                if not name.endswith('.cache'):
+                    continue
+                if self._read_header(path)[0]['expires_at'] <= now:
+                    self._unlink(path)
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            except Exception:
+                continue
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    def _unlink(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _check_private_directory(directory):
+    """Raise PermissionError unless directory is a real directory only the current user can write to."""
+    stat = os.lstat(directory)
+    if not S_ISDIR(stat.st_mode):
+        raise PermissionError(f"{directory} is not a directory")
+    if hasattr(os, 'getuid') and stat.st_uid != os.getuid():
+        raise PermissionError(f"{directory} is owned by another user")
+    if stat.st_mode & 0o022:
+        raise PermissionError(f"{directory} is writable by group or others")
+
+
+def default_shared_dir():
+    """Per-user directory of the file backend when no shared_dir is configured."""
+    user = os.getuid() if hasattr(os, 'getuid') else getpass.getuser()
+    return os.path.join(tempfile.gettempdir(), f'financial-dashboard-cache-{user}')
+
+
+def create_shared_backend(cache_config):
+    """
+    Create the shared cache backend selected in the cache configuration.
+
+    Args:
+        cache_config (dict): config['cache'] with shared_backend, shared_dir
+            (defaults to a per-user directory under the system temp dir) and
+            shared_max_mb
+
+    Returns:
+        CacheBackend: The backend, or None when shared caching is disabled
+    """
+    backend = (cache_config.get('shared_backend') or '').lower()
+    if not backend:
+        return None
+
+    if backend == 'file':
+        try:
+            return FileCacheBackend(
+                cache_config.get('shared_dir') or default_shared_dir(),
+                max_bytes=cache_config.get('shared_max_mb', 256) * 1024 * 1024
+            )
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Shared cache directory unavailable or not private, shared caching disabled: {e}")
+            return None
+
+    logging.getLogger(__name__).warning(f"Unknown shared cache backend '{backend}', shared caching disabled")
+    return None
+
+
+def read_csv_shared(path, backend=None, ttl=86400):
+    """
+    Read a CSV file once for all workers when a shared backend is configured.
+
+    The parsed frame is stored under the file's path and modification time,
+    so workers after the first one map it from the shared store instead of
+    parsing and holding their own copy.
+
+    Args:
+        path (str): CSV file path
+        backend (CacheBackend): Shared backend, or None to just read the file
+        ttl (float): Seconds the parsed frame stays in the shared store
+
+    Returns:
+        pd.DataFrame: The CSV contents
+    """
+    if backend is None:
+        return pd.read_csv(path)
+
+    key = f"csv:{os.path.abspath(path)}:{os.path.getmtime(path)}"
+    df = backend.get(key)
+    if df is None:
+        df = pd.read_csv(path)
+        try:
+            backend.set(key, df, ttl)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Could not share parsed {path}: {str(e)}")
+    return df
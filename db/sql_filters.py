@@ -0,0 +1,115 @@
+"""
+Parameter binding helpers for SQL filters
+"""
+
+import logging
+import numbers
+
+# Lists longer than this are loaded into a temporary table instead of placeholders
+IN_LIST_TEMP_THRESHOLD = 1024
+
+
+def placeholder_bucket(count):
+    """
+    Round a placeholder count up to the next power of two.
+
+    Args:
+        count (int): Number of values
+
+    Returns:
+        int: Bucket size (at least 1)
+    """
+    bucket = 1
+    while bucket < count:
+        bucket *= 2
+    return bucket
+
+
+class InListBinder:
+    """
+    Builds IN-list predicates for the statements run on one cursor.
+
+    Short lists are bound as placeholders padded to a power-of-two count by
+    repeating the last value, so lists of similar length share one SQL text
+    and HANA plan cache entry instead of producing a new statement per
+    length. Lists above the threshold are inserted into a session-local
+    temporary table and matched with a subquery against it, which avoids
+    parsing thousands of placeholders. The temporary tables live on the
+    cursor's connection, so the statement must run on the same cursor;
+    they are dropped when the binder is closed.
+
+    Usage:
+        with InListBinder(cursor) as in_list:
+            clause, params = in_list('"TICKER"', tickers)
+            cursor.execute(f'SELECT ... WHERE {clause}', params)
+    """
+
+    def __init__(self, cursor, threshold=IN_LIST_TEMP_THRESHOLD):
+        """
+        Initialize the binder.
+
+        Args:
+            cursor: Cursor the filtered statement will be executed on
+            threshold (int): Longest list bound as placeholders
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cursor = cursor
+        self.threshold = threshold
+        self._temp_tables = []
+
+    def __call__(self, expression, values):
+        """
+        Build an IN predicate.
+
+        Args:
+            expression (str): Quoted column or SQL expression to filter
+            values (iterable): Values to match
+
+        Returns:
+            tuple: (SQL predicate, parameter list)
+        """
+        values = list(dict.fromkeys(values))
+        if not values:
+            return '1=0', []
+
+        if len(values) > self.threshold:
+            table = self._load_temp_table(values)
+            return f'{expression} IN (SELECT "VALUE" FROM "{table}")', []
+
+        padded = values + [values[-1]] * (placeholder_bucket(len(values)) - len(values))
+        return f"{expression} IN ({', '.join('?' for _ in padded)})", padded
+
+    def _load_temp_table(self, values):
+        """Create a local temporary table holding values; returns its name."""
+        table = f"#IN_LIST_{len(self._temp_tables) + 1}"
+        is_integer = all(isinstance(v, numbers.Integral) and not isinstance(v, bool) for v in values)
+        column_type = 'BIGINT' if is_integer else 'NVARCHAR(5000)'
+
+        try:
+            self.cursor.execute(f'DROP TABLE "{table}"')
+        except Exception:
+            pass  # Not left over from an earlier statement in this session
+
+        self.cursor.execute(f'CREATE LOCAL TEMPORARY COLUMN TABLE "{table}" ("VALUE" {column_type})')
+        self._temp_tables.append(table)
+        self.cursor.executemany(
+            f'INSERT INTO "{table}" VALUES (?)',
+            [[int(v)] if is_integer else [str(v)] for v in values]
+        )
+        return table
+
+    def close(self):
+        """Drop the temporary tables created for this binder."""
+        while self._temp_tables:
+            table = self._temp_tables.pop()
+            try:
+                self.cursor.execute(f'DROP TABLE "{table}"')
+            except Exception as e:
+                self.logger.warning(f"Could not drop temporary table {table}: {str(e)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
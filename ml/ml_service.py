@@ -12,6 +12,9 @@ import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from db.result_cache import SingleFlight
+from db.sql_filters import InListBinder
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,14 +35,19 @@ class MLService:
         self.schema = ml_schema or "BLOOMBERG_DATA"
         self.data_schema = data_schema or "BLOOMBERG_DATA"
         self._model_cache = {}
+        # Coalesces concurrent identical HANA queries (dashboard callbacks fire together)
+        self._flight = SingleFlight()
         # Optional CSV fallback DataFrame — set from app.py after csv_data loads
         self.csv_fallback_df = None
+        # Optional cross-worker store for model artifacts — set from app.py
+        self.shared_cache = None
         logger.info(f"MLService initialized with ML schema: {self.schema}, Data schema: {self.data_schema}")
         
     def get_active_models(self) -> List[Dict]:
         """Get list of all active ML models"""
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             cursor.execute(f"""
                 SELECT "MODEL_ID", "MODEL_NAME", "MODEL_TYPE", "VERSION", 
                        "TRAINING_ROWS", "CREATED_AT"
@@ -67,6 +75,9 @@ class MLService:
         except Exception as e:
             logger.error(f"Error getting active models: {e}")
             return []
+        finally:
+            if cursor:
+                cursor.close()
     
     def load_model(self, model_name: str) -> Tuple[Any, Any, List[str], Dict]:
         """
@@ -78,18 +89,34 @@ class MLService:
             logger.debug(f"Model {model_name} loaded from cache")
             return self._model_cache[model_name]
             
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
-            cursor.execute(f"""
-                SELECT "MODEL_BLOB", "SCALER_BLOB", "FEATURE_COLUMNS", "METRICS"
-                FROM "{self.schema}"."ML_MODELS"
-                WHERE "MODEL_NAME" = ? AND "IS_ACTIVE" = 1
-            """, (model_name,))
-            
-            row = cursor.fetchone()
-            if not row:
-                logger.warning(f"No active model found: {model_name} in schema {self.schema}")
-                return None, None, [], {}
+            # Another worker may already have fetched the artifacts from HANA
+            shared_key = f"model:{self.schema}:{model_name}"
+            row = self.shared_cache.get(shared_key) if self.shared_cache else None
+
+            if row is None:
+                cursor = self.hana_client.cursor()
+                cursor.execute(f"""
+                    SELECT "MODEL_BLOB", "SCALER_BLOB", "FEATURE_COLUMNS", "METRICS"
+                    FROM "{self.schema}"."ML_MODELS"
+                    WHERE "MODEL_NAME" = ? AND "IS_ACTIVE" = 1
+                """, (model_name,))
+                
+                row = cursor.fetchone()
+                if not row:
+                    logger.warning(f"No active model found: {model_name} in schema {self.schema}")
+                    return None, None, [], {}
+
+                # Read the LOB values before the connection goes back to the pool
+                row = tuple(self._lob_value(v) for v in row)
+                cursor.close()
+
+                if self.shared_cache:
+                    try:
+                        self.shared_cache.set(shared_key, row, 3600)
+                    except Exception as e:
+                        logger.warning(f"Could not share model artifacts for {model_name}: {e}")
             
             model_bytes, scaler_bytes, features_json, metrics_json = row
             
@@ -121,11 +148,24 @@ class MLService:
             else:
                 logger.error(f"Error loading model {model_name}: {e}")
             return None, None, [], {}
+        finally:
+            if cursor:
+                cursor.close()
     
+    @staticmethod
+    def _lob_value(value):
+        """Materialise a LOB column value (locator, memoryview or bytes) as plain data"""
+        if hasattr(value, 'read'):
+            value = value.read()
+        if isinstance(value, (bytearray, memoryview)):
+            value = bytes(value)
+        return value
+
     def get_cluster_labels(self, model_name: str) -> List[Dict]:
         """Get cluster labels for a clustering model"""
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             cursor.execute(f"""
                 SELECT cl."CLUSTER_ID", cl."CLUSTER_LABEL", cl."SAMPLE_COUNT", cl."AVG_HEALTH_SCORE"
                 FROM "{self.schema}"."ML_CLUSTER_LABELS" cl
@@ -148,48 +188,21 @@ class MLService:
         except Exception as e:
             logger.error(f"Error getting cluster labels: {e}")
             return []
+        finally:
+            if cursor:
+                cursor.close()
     
     def get_company_data(self, tickers: List[str] = None) -> pd.DataFrame:
         """Get latest financial data for specified companies"""
         try:
-            cursor = self.hana_client.connection.cursor()
-            
-            # First get all data from latest date
-            query = f"""
-                SELECT * FROM "{self.data_schema}"."FINANCIAL_RATIOS"
-                WHERE "DATA_DATE" = (SELECT MAX("DATA_DATE") FROM "{self.data_schema}"."FINANCIAL_RATIOS")
-            """
-            cursor.execute(query)
-            
-            columns = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            
-            df = pd.DataFrame(rows, columns=columns)
-            logger.info(f"Loaded {len(df)} rows from FINANCIAL_RATIOS")
+            # Concurrent callers share one HANA query; each filters its own copy
+            df = self._flight.do('latest_financial_ratios', self._load_latest_ratios).copy()
 
             # If HANA table is empty, use CSV fallback immediately
             if df.empty and self.csv_fallback_df is not None:
                 logger.info("get_company_data: FINANCIAL_RATIOS empty, using CSV fallback")
                 return self._filter_csv_fallback(self.csv_fallback_df, tickers)
             
-            # Convert Decimal to float
-            for col in df.columns:
-                if df[col].dtype == object:
-                    try:
-                        df[col] = pd.to_numeric(df[col], errors='ignore')
-                    except:
-                        pass
-            
-            # Normalize ticker column - remove " US Equity" suffix if present
-            if 'TICKER' in df.columns:
-                df['TICKER'] = df['TICKER'].str.replace(' US Equity', '', regex=False)
-                logger.debug(f"Available tickers: {df['TICKER'].unique().tolist()[:10]}")
-            
-            # Deduplicate by TICKER - keep first row per ticker
-            if 'TICKER' in df.columns:
-                df = df.drop_duplicates(subset=['TICKER'], keep='first')
-                logger.info(f"After deduplication: {len(df)} unique tickers")
-            
             # Filter by tickers if provided
             if tickers and 'TICKER' in df.columns:
                 # Normalize input tickers - filter out non-ticker values (like company names)
@@ -228,6 +241,49 @@ class MLService:
                 logger.info("get_company_data: HANA error, falling back to CSV data")
                 return self._filter_csv_fallback(self.csv_fallback_df, tickers)
             return pd.DataFrame()
+
+    def _load_latest_ratios(self) -> pd.DataFrame:
+        """Query FINANCIAL_RATIOS rows of the latest DATA_DATE, one per normalised ticker"""
+        cursor = self.hana_client.cursor()
+        try:
+            # First get all data from latest date
+            query = f"""
+                SELECT * FROM "{self.data_schema}"."FINANCIAL_RATIOS"
+                WHERE "DATA_DATE" = (SELECT MAX("DATA_DATE") FROM "{self.data_schema}"."FINANCIAL_RATIOS")
+            """
+            cursor.execute(query)
+            
+            columns = [desc[0] for desc in cursor.description]
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        
+        df = pd.DataFrame(rows, columns=columns)
+        logger.info(f"Loaded {len(df)} rows from FINANCIAL_RATIOS")
+        
+        # Convert Decimal to float
+        for col in df.columns:
+            if df[col].dtype == object:
+                try:
+                    df[col] = pd.to_numeric(df[col], errors='ignore')
+                except:
+                    pass
+        
+        # Normalize ticker column - remove " US Equity" suffix if present
+        if 'TICKER' in df.columns:
+            df['TICKER'] = df['TICKER'].str.replace(' US Equity', '', regex=False)
+            logger.debug(f"Available tickers: {df['TICKER'].unique().tolist()[:10]}")
+        
+        # Deduplicate by TICKER - keep first row per ticker
+        if 'TICKER' in df.columns:
+            df = df.drop_duplicates(subset=['TICKER'], keep='first')
+            logger.info(f"After deduplication: {len(df)} unique tickers")
+        
+        return df
+
+    def get_coalescing_stats(self) -> Dict:
+        """Get counts of HANA queries shared between concurrent get_company_data calls"""
+        return self._flight.get_stats()
     
     def _filter_csv_fallback(self, df: pd.DataFrame, tickers: List[str] = None) -> pd.DataFrame:
         """Filter and return CSV fallback data, applying same normalisation as HANA path."""
@@ -250,8 +306,9 @@ class MLService:
 
     def get_advanced_data(self, tickers: List[str] = None) -> pd.DataFrame:
         """Get advanced financial data"""
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             
             query = f"""
                 SELECT * FROM "{self.data_schema}"."FINANCIAL_DATA_ADVANCED"
@@ -282,6 +339,9 @@ class MLService:
         except Exception as e:
             logger.error(f"Error getting advanced data: {e}")
             return pd.DataFrame()
+        finally:
+            if cursor:
+                cursor.close()
     
     def _analyze_ratios_without_model(self, df: pd.DataFrame) -> Dict:
         """
@@ -665,8 +725,11 @@ class MLService:
         Revenue / EBITDA / Net Income are summed per fiscal year.
         Margin metrics are averaged per fiscal year.
         """
+        cursor = None
+        in_list = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
+            in_list = InListBinder(cursor)
 
             # Normalise tickers - strip ' US Equity' suffix, keep only valid symbols
             if tickers:
@@ -678,7 +741,7 @@ class MLService:
                 if not normalized:
                     normalized = [t.replace(' US Equity', '').strip() for t in tickers]
 
-                placeholders = ', '.join(['?' for _ in normalized])
+                ticker_filter, params = in_list('"TICKER"', normalized)
                 query = f"""
                     SELECT "TICKER", "FISCAL_YEAR",
                            SUM("SALES_REV_TURN")  AS "SALES_REV_TURN",
@@ -687,11 +750,11 @@ class MLService:
                            AVG("EBITDA_MARGIN")    AS "EBITDA_MARGIN",
                            AVG("GROSS_MARGIN")     AS "GROSS_MARGIN"
                     FROM "{self.data_schema}"."ANNUAL_FINANCIALS_10K"
-                    WHERE "TICKER" IN ({placeholders})
+                    WHERE {ticker_filter}
                     GROUP BY "TICKER", "FISCAL_YEAR"
                     ORDER BY "TICKER", "FISCAL_YEAR"
                 """
-                cursor.execute(query, normalized)
+                cursor.execute(query, params)
             else:
                 query = f"""
                     SELECT "TICKER", "FISCAL_YEAR",
@@ -723,6 +786,11 @@ class MLService:
         except Exception as e:
             logger.error(f"Error fetching annual historicals: {e}")
             return pd.DataFrame()
+        finally:
+            if in_list:
+                in_list.close()
+            if cursor:
+                cursor.close()
 
     def _compute_cagr_forecast(self, series_vals: list, series_years: list) -> Dict:
         """
@@ -910,8 +978,9 @@ class MLService:
         (taking the latest row per year) so repeated quarterly snapshots don't collapse
         the CAGR to zero.
         """
+        cursor = None
         try:
-            cursor = self.hana_client.connection.cursor()
+            cursor = self.hana_client.cursor()
             # Pull one row per fiscal year (latest snapshot for that year)
             cursor.execute(f"""
                 SELECT "FISCAL_YEAR",
@@ -927,6 +996,7 @@ class MLService:
                 ORDER BY "FISCAL_YEAR" ASC
             """)
             rows = cursor.fetchall()
+            cursor.close()
 
             if rows and len(rows) >= 2:
                 def _safe_int_year(val):
@@ -973,6 +1043,9 @@ class MLService:
 
         except Exception as e:
             logger.warning(f"Could not fetch META from HANA: {e} — using reference dataset")
+        finally:
+            if cursor:
+                cursor.close()
 
         logger.info("META: using hardcoded reference dataset")
         return dict(self.META_HISTORICAL)
@@ -14,10 +14,320 @@ import numpy as np
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
+import threading
+
+from utils.acdoca_frame import CompactAcdocaFrame
 
 logger = logging.getLogger(__name__)
 
 
+class PLCube:
+    """
+    Dense P&L totals per (company code, fiscal year, period, category)
+    
+    Built from journal lines in a single pass; any slice of companies, years
+    and periods is then answered by indexing the arrays instead of filtering
+    the lines again. Amounts are stored as booked (no P&L sign applied).
+    """
+    
+    DIMENSIONS = ('RBUKRS', 'GJAHR', 'POPER')
+    
+    def __init__(self, companies, years, periods, categories, amounts, counts):
+        """
+        Args:
+            companies, years, periods: Sorted labels of the first three axes
+            categories: Category names of the last axis
+            amounts: float array shaped (companies, years, periods, categories)
+            counts: Line counts with the same shape
+        """
+        self.axes = {'RBUKRS': list(companies), 'GJAHR': list(years), 'POPER': list(periods)}
+        self.categories = list(categories)
+        self.amounts = amounts
+        self.counts = counts
+    
+    @classmethod
+    def from_lines(cls, df: pd.DataFrame, amount_col: str, category_codes: np.ndarray,
+                   categories: List[str]) -> 'PLCube':
+        """
+        Aggregate journal lines into a cube
+        
+        Args:
+            df: Lines with RBUKRS, GJAHR, POPER and the amount column
+            amount_col: Amount column to sum (missing amounts count as 0)
+            category_codes: Category position of each line (-1 to skip it)
+            categories: Category names
+        
+        Returns:
+            PLCube
+        """
+        codes = []
+        labels = []
+        for dimension in cls.DIMENSIONS:
+            values = df[dimension]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Compact frames: order labels by value, not by dictionary position
+                values = values.cat.remove_unused_categories()
+                values = values.cat.reorder_categories(sorted(values.cat.categories))
+            dimension_codes, dimension_labels = pd.factorize(values, sort=True)
+            codes.append(dimension_codes)
+            labels.append(dimension_labels.tolist())
+        
+        shape = tuple(len(dimension_labels) for dimension_labels in labels) + (len(categories),)
+        size = int(np.prod(shape))
+        valid = category_codes >= 0
+        for dimension_codes in codes:
+            valid &= dimension_codes >= 0
+        
+        if size == 0 or not valid.any():
+            amounts = np.zeros(shape)
+            counts = np.zeros(shape, dtype=np.int64)
+        else:
+            # Flat cell index per line; skipped lines go to a trailing bucket that is dropped
+            cells = np.ravel_multi_index(tuple(codes) + (category_codes,), shape, mode='clip')
+            cells = np.where(valid, cells, size)
+            weights = np.nan_to_num(df[amount_col].to_numpy(dtype=np.float64))
+            amounts = np.bincount(cells, weights=weights, minlength=size + 1)[:size].reshape(shape)
+            counts = np.bincount(cells, minlength=size + 1)[:size].reshape(shape)
+        
+        return cls(*labels, categories, amounts, counts)
+    
+    def labels(self, dimension: str, selected=None) -> list:
+        """Labels of a dimension, restricted to the selected ones when given"""
+        if not selected:
+            return list(self.axes[dimension])
+        wanted = set(selected)
+        return [label for label in self.axes[dimension] if label in wanted]
+    
+    def _slice(self, array, company_codes, years, periods):
+        """Restrict the first three axes to the selected labels"""
+        for axis, (dimension, selected) in enumerate(zip(self.DIMENSIONS, (company_codes, years, periods))):
+            if selected:
+                wanted = set(selected)
+                positions = [i for i, label in enumerate(self.axes[dimension]) if label in wanted]
+                array = np.take(array, positions, axis=axis)
+        return array
+    
+    def category_totals(self, company_codes=None, years=None, periods=None) -> Dict[str, float]:
+        """
+        Sum amounts per category over a slice
+        
+        Args:
+            company_codes, years, periods: Labels to keep (None or empty keeps all)
+        
+        Returns:
+            Dictionary of category -> amount as booked
+        """
+        totals = self._slice(self.amounts, company_codes, years, periods).sum(axis=(0, 1, 2))
+        return dict(zip(self.categories, totals.tolist()))
+    
+    def monthly(self, category: str, company_codes=None, years=None) -> pd.DataFrame:
+        """
+        Amounts of one category per (year, period) with posted lines
+        
+        Returns:
+            DataFrame with GJAHR, POPER and Amount (as booked), ordered by year and period
+        """
+        position = self.categories.index(category)
+        amounts = self._slice(self.amounts[..., position], company_codes, years, None).sum(axis=0)
+        counts = self._slice(self.counts[..., position], company_codes, years, None).sum(axis=0)
+        year_labels = self.labels('GJAHR', years)
+        year_index, period_index = np.nonzero(counts)
+        return pd.DataFrame({
+            'GJAHR': [year_labels[i] for i in year_index],
+            'POPER': [self.axes['POPER'][i] for i in period_index],
+            'Amount': amounts[year_index, period_index],
+        })
+
+
+class AcdocaAggregates:
+    """
+    Amounts per company code x year x period x account x cost center,
+    maintained from batches of newly posted journal lines
+    
+    Each batch is reduced with aggregate_acdoca_chunks and its per-key deltas
+    are added to the rows of the touched keys only, so an intraday posting
+    costs in proportion to the batch, not to the lines or keys already held.
+    Amounts are DECIMAL(17,2) in ACDOCA and are summed as integer cents: the
+    totals do not depend on how the lines were split into batches, and
+    to_frame matches a full recompute (from_lines over all lines) exactly.
+    
+    New lines are found by their "INSERTED_AT" timestamp. Identity values and
+    insert timestamps are assigned at insert time, not commit time, so a
+    line may become visible after later ones (e.g. parallel loads per company
+    code): every refresh re-reads the overlap window before the watermark
+    and skips the lines already applied by "ID". IDs are remembered only for
+    lines inside the window, so memory stays bounded by the posting volume of
+    the window. The window must exceed the longest loading transaction.
+    Lines without INSERTED_AT or ID are applied as given.
+    """
+    
+    KEYS = ('RBUKRS', 'GJAHR', 'POPER', 'RACCT', 'RCNTR')
+    VALUES = ('HSL', 'KSL')
+    
+    # Minor units per currency unit of the DECIMAL(17,2) amounts
+    SCALE = 100
+    
+    # Seconds before the watermark that every refresh reads again
+    DEFAULT_OVERLAP_SECONDS = 600
+    
+    def __init__(self, overlap_seconds: float = DEFAULT_OVERLAP_SECONDS):
+        """
+        Args:
+            overlap_seconds: Width of the re-read window before the watermark
+        """
+        self.overlap = pd.Timedelta(seconds=overlap_seconds)
+        self.watermark = None
+        self.line_count = 0
+        
+        self._lock = threading.Lock()        # guards the totals and to_frame
+        self._apply_lock = threading.Lock()  # one batch applied at a time
+        self._rows = {}                      # key tuple -> row of _sums
+        self._keys = []                      # key tuples by row
+        self._sums = np.zeros((0, len(self.VALUES) + 1), dtype=np.int64)  # cents..., LINES
+        self._recent_ids = {}                # ID -> INSERTED_AT of lines in the window
+        self._frame = None
+    
+    @classmethod
+    def from_lines(cls, lines, overlap_seconds: float = DEFAULT_OVERLAP_SECONDS) -> 'AcdocaAggregates':
+        """Aggregate all lines at once (full recompute)"""
+        aggregates = cls(overlap_seconds)
+        aggregates.apply(lines)
+        return aggregates
+    
+    @property
+    def since(self):
+        """INSERTED_AT from which the next refresh must read (None: everything)"""
+        return None if self.watermark is None else self.watermark - self.overlap
+    
+    def apply(self, lines) -> int:
+        """
+        Apply new journal lines
+        
+        Args:
+            lines: DataFrame or CompactAcdocaFrame with the KEYS and VALUES
+                columns (and "ID"/"INSERTED_AT" for duplicate tracking)
+        
+        Returns:
+            Number of lines applied
+        """
+        return self.apply_chunks([lines])
+    
+    def apply_chunks(self, chunks) -> int:
+        """
+        Apply new journal lines delivered in chunks
+        
+        The chunks are reduced first and committed together, so an error
+        while reading them leaves the aggregates unchanged and the same batch
+        can be applied again.
+        
+        Args:
+            chunks: Iterable of line DataFrames, e.g. FinancialDataService.iter_acdoca_data()
+        
+        Returns:
+            Number of lines applied
+        """
+        with self._apply_lock:
+            since = self.since
+            staged_ids = {}
+            watermark = self.watermark
+            
+            def new_lines():
+                nonlocal watermark
+                for chunk in chunks:
+                    chunk = _as_frame(chunk)
+                    if chunk is None or chunk.empty:
+                        continue
+                    if 'ID' in chunk.columns and 'INSERTED_AT' in chunk.columns:
+                        inserted = pd.to_datetime(chunk['INSERTED_AT'])
+                        ids = chunk['ID'].tolist()
+                        fresh = np.fromiter(
+                            (i not in self._recent_ids and i not in staged_ids for i in ids),
+                            dtype=bool, count=len(ids))
+                        if since is not None:
+                            # Older lines were read by an earlier refresh (NULL ones are kept)
+                            fresh &= ~(inserted < since).to_numpy()
+                        chunk = chunk[fresh]
+                        inserted = inserted[fresh]
+                        staged_ids.update(zip(chunk['ID'].tolist(), inserted.tolist()))
+                        latest = inserted.max()
+                        if pd.notna(latest) and (watermark is None or latest > watermark):
+                            watermark = latest
+                    if not chunk.empty:
+                        yield self._to_cents(chunk)
+            
+            delta = aggregate_acdoca_chunks(new_lines(), by=self.KEYS, values=self.VALUES + ('LINES',))
+            
+            with self._lock:
+                self._add(delta)
+                self.watermark = watermark
+                self._recent_ids.update(staged_ids)
+                if self.since is not None:
+                    cutoff = self.since
+                    self._recent_ids = {i: at for i, at in self._recent_ids.items()
+                                        if pd.isna(at) or at >= cutoff}
+            
+            applied = int(delta['LINES'].sum()) if len(delta) else 0
+            self.line_count += applied
+            return applied
+    
+    def _to_cents(self, lines: pd.DataFrame) -> pd.DataFrame:
+        """Key columns with the amounts in cents and a line counter"""
+        batch = lines[list(self.KEYS)].copy()
+        for value in self.VALUES:
+            amounts = np.nan_to_num(lines[value].to_numpy(dtype=np.float64))
+            batch[value] = np.rint(amounts * self.SCALE).astype(np.int64)
+        batch['LINES'] = np.ones(len(batch), dtype=np.int64)
+        return batch
+    
+    def _add(self, delta: pd.DataFrame):
+        """Add reduced deltas to the rows of their keys (call with the lock held)"""
+        if delta.empty:
+            return
+        
+        columns = [[None if pd.isna(v) else v for v in delta[key].tolist()] for key in self.KEYS]
+        rows = np.empty(len(delta), dtype=np.intp)
+        for position, key in enumerate(zip(*columns)):
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._keys)
+                self._rows[key] = row
+                self._keys.append(key)
+            rows[position] = row
+        
+        if len(self._keys) > len(self._sums):
+            grown = np.zeros((max(len(self._keys), 2 * len(self._sums)), self._sums.shape[1]), dtype=np.int64)
+            grown[:len(self._sums)] = self._sums
+            self._sums = grown
+        
+        # Keys are unique within a reduced delta, so a fancy-indexed add is safe
+        self._sums[rows] += delta[list(self.VALUES) + ['LINES']].to_numpy(dtype=np.int64)
+        self._frame = None
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the aggregates as ACDOCA-shaped rows
+        
+        Rows are sorted by key so equal totals give an identical frame
+        whatever the order the lines were applied in. The frame is built on
+        first use after a change and can replace line items in
+        ACDOCAAnalytics (see set_aggregates).
+        
+        Returns:
+            DataFrame with the KEYS, the summed VALUES and LINES (line count)
+        """
+        with self._lock:
+            if self._frame is None:
+                count = len(self._keys)
+                columns = list(zip(*self._keys)) if count else [()] * len(self.KEYS)
+                frame = pd.DataFrame({key: list(values) for key, values in zip(self.KEYS, columns)})
+                sums = self._sums[:count]
+                for position, value in enumerate(self.VALUES):
+                    frame[value] = sums[:, position] / self.SCALE
+                frame['LINES'] = sums[:, -1]
+                self._frame = frame.sort_values(list(self.KEYS), ignore_index=True)
+            return self._frame
+
+
 class ACDOCAAnalytics:
     """Analytics engine for ACDOCA data"""
     
@@ -90,22 +400,89 @@ class ACDOCAAnalytics:
         },
     }
     
+    # Derived P&L lines and their position between the categories above
+    PL_DERIVED = {
+        'Net Revenue': 2.5,
+        'Gross Profit': 3.5,
+        'Total OpEx': 9.5,
+        'EBITDA': 9.6,
+        'EBIT': 9.7,
+        'EBT': 12.5,
+        'Net Income': 14,
+    }
+    
+    OPEX_CATEGORIES = ('Personnel', 'Facilities', 'Sales & Marketing', 'R&D', 'D&A', 'G&A')
+    
     def __init__(self, df_acdoca: pd.DataFrame = None, df_budget: pd.DataFrame = None):
         """
         Initialize analytics with data
         
         Args:
-            df_acdoca: ACDOCA actuals DataFrame
+            df_acdoca: ACDOCA actuals DataFrame or CompactAcdocaFrame
             df_budget: Budget DataFrame
         """
         self.df_acdoca = df_acdoca
         self.df_budget = df_budget
+        # (source, amount column) -> (DataFrame the cube was built from, PLCube)
+        self._pl_cubes = {}
+    
+    @property
+    def df_acdoca(self) -> Optional[pd.DataFrame]:
+        """Actuals: the line items, or the current frame of the maintained aggregates"""
+        if self._aggregates is not None:
+            return self._aggregates.to_frame()
+        return self._df_acdoca
+    
+    @df_acdoca.setter
+    def df_acdoca(self, df_acdoca):
+        self._df_acdoca = _as_frame(df_acdoca)
+        self._aggregates = None
     
     def set_data(self, df_acdoca: pd.DataFrame, df_budget: pd.DataFrame = None):
         """Set or update the data"""
         self.df_acdoca = df_acdoca
         self.df_budget = df_budget
     
+    def set_aggregates(self, aggregates: 'AcdocaAggregates', df_budget: pd.DataFrame = None):
+        """
+        Answer queries from maintained aggregates instead of line items
+        
+        Queries read the aggregates' current frame, so later refreshes of the
+        same object (FinancialDataService.refresh_acdoca_aggregates) show up
+        without calling this again. The P&L, budget, trend, YoY and KPI
+        methods work on the aggregates; cost center analysis needs line items
+        (document counts).
+        
+        Args:
+            aggregates: AcdocaAggregates, e.g. from FinancialDataService.refresh_acdoca_aggregates()
+            df_budget: Budget DataFrame (kept when omitted)
+        """
+        self._df_acdoca = None
+        self._aggregates = aggregates
+        if df_budget is not None:
+            self.df_budget = df_budget
+    
+    def append_data(self, df_new: pd.DataFrame) -> int:
+        """
+        Apply newly posted journal lines incrementally
+        
+        On first use the current line items are aggregated once and the
+        instance switches to maintained aggregates (see set_aggregates);
+        each later call only reduces the new lines. Lines carrying "ID" and
+        "INSERTED_AT" that were already applied are skipped (see
+        AcdocaAggregates).
+        
+        Args:
+            df_new: New ACDOCA lines (DataFrame or CompactAcdocaFrame)
+        
+        Returns:
+            Number of lines applied
+        """
+        if self._aggregates is None:
+            self.set_aggregates(AcdocaAggregates.from_lines(self._df_acdoca)
+                                if self._df_acdoca is not None else AcdocaAggregates())
+        return self._aggregates.apply(df_new)
+    
     def get_pl_summary(
         self,
         company_codes: List[str] = None,
@@ -128,83 +505,165 @@ class ACDOCAAnalytics:
         if self.df_acdoca is None or self.df_acdoca.empty:
             return pd.DataFrame()
         
-        df = self.df_acdoca.copy()
+        cube = self.get_pl_cube(currency)
+        return self.build_pl_summary(cube.category_totals(company_codes, [year] if year else None, periods))
+    
+    def get_pl_summaries(
+        self,
+        by: str = 'RBUKRS',
+        company_codes: List[str] = None,
+        years: List[int] = None,
+        periods: List[int] = None,
+        currency: str = 'USD'
+    ) -> Dict:
+        """
+        Generate one P&L summary per company code, year or period
         
-        # Apply filters
-        if company_codes:
-            df = df[df['RBUKRS'].isin(company_codes)]
-        if year:
-            df = df[df['GJAHR'] == year]
-        if periods:
-            df = df[df['POPER'].isin(periods)]
+        All summaries are sliced from the same P&L cube, e.g. to draw a grid of
+        companies or periods without re-reading the journal lines.
         
-        # Use appropriate amount column
-        amount_col = 'KSL' if currency == 'USD' else 'HSL'
+        Args:
+            by: 'RBUKRS', 'GJAHR' or 'POPER'
+            company_codes: Filter by company codes
+            years: Filter by fiscal years
+            periods: List of periods (1-12)
+            currency: 'USD' for global, 'LOCAL' for company currency
         
-        # Aggregate by account
-        account_totals = df.groupby('RACCT')[amount_col].sum().to_dict()
+        Returns:
+            Dictionary of label -> DataFrame with P&L line items
+        """
+        if self.df_acdoca is None or self.df_acdoca.empty:
+            return {}
         
-        # Build P&L structure
-        pl_data = []
-        for category, config in self.PL_STRUCTURE.items():
-            total = sum(
-                account_totals.get(acc, 0) * config['sign']
-                for acc in config['accounts']
-            )
-            pl_data.append({
-                'Category': category,
-                'Amount': total,
-                'Order': config['order'],
-            })
+        cube = self.get_pl_cube(currency)
+        selection = {'RBUKRS': company_codes, 'GJAHR': years, 'POPER': periods}
+        summaries = {}
+        for label in cube.labels(by, selection[by]):
+            selection_one = dict(selection, **{by: [label]})
+            summaries[label] = self.build_pl_summary(cube.category_totals(
+                selection_one['RBUKRS'], selection_one['GJAHR'], selection_one['POPER']))
+        return summaries
+    
+    def get_pl_cube(self, currency: str = 'USD', source: str = 'actual') -> 'PLCube':
+        """
+        Get the P&L cube of the actuals or budget, building it on first use
         
-        df_pl = pd.DataFrame(pl_data)
-        df_pl = df_pl.sort_values('Order')
+        The cube is rebuilt only when the underlying DataFrame is replaced.
         
-        # Calculate derived metrics
-        revenue = df_pl[df_pl['Category'] == 'Revenue']['Amount'].sum()
-        contra_rev = df_pl[df_pl['Category'] == 'Contra Revenue']['Amount'].sum()
-        net_revenue = revenue - contra_rev
+        Args:
+            currency: 'USD' for global, 'LOCAL' for company currency
+            source: 'actual' (df_acdoca) or 'budget' (df_budget, always USD)
         
-        cogs = df_pl[df_pl['Category'] == 'COGS']['Amount'].sum()
-        gross_profit = net_revenue - cogs
+        Returns:
+            PLCube with category totals per company code, year and period
+        """
+        df = self.df_acdoca if source == 'actual' else self.df_budget
+        amount_col = 'KSL' if currency == 'USD' or source == 'budget' else 'HSL'
         
-        opex_categories = ['Personnel', 'Facilities', 'Sales & Marketing', 'R&D', 'D&A', 'G&A']
-        total_opex = df_pl[df_pl['Category'].isin(opex_categories)]['Amount'].sum()
+        cached = self._pl_cubes.get((source, amount_col))
+        if cached is not None and cached[0] is df:
+            return cached[1]
         
-        ebitda = gross_profit - (total_opex - df_pl[df_pl['Category'] == 'D&A']['Amount'].sum())
-        ebit = gross_profit - total_opex
+        cube = PLCube.from_lines(df, amount_col, self.account_category_codes(df['RACCT']),
+                                 list(self.PL_STRUCTURE))
+        self._pl_cubes[(source, amount_col)] = (df, cube)
+        return cube
+    
+    @classmethod
+    def account_category_codes(cls, accounts: pd.Series) -> np.ndarray:
+        """
+        Map each line's account to its PL_STRUCTURE position (-1 outside the P&L)
+        
+        Distinct accounts are factorized and looked up once, then broadcast
+        to the lines through an index array.
+        """
+        account_codes, unique_accounts = pd.factorize(accounts)
+        category_of = {
+            acc: position
+            for position, config in enumerate(cls.PL_STRUCTURE.values())
+            for acc in config['accounts']
+        }
+        # Trailing -1 is what factorize's missing-value code (-1) indexes
+        lookup = np.array([category_of.get(acc, -1) for acc in unique_accounts] + [-1], dtype=np.intp)
+        return lookup[account_codes]
+    
+    @classmethod
+    def compile_pl_category_case(cls, account_column: str = '"RACCT"') -> str:
+        """
+        Compile PL_STRUCTURE into a SQL CASE expression mapping accounts to categories
+        
+        Used to aggregate journal lines per P&L category in the database, so only
+        one row per category is returned; rows of accounts outside the structure
+        map to NULL.
         
-        interest_net = (
-            df_pl[df_pl['Category'] == 'Interest Expense']['Amount'].sum() -
-            df_pl[df_pl['Category'] == 'Interest Income']['Amount'].sum()
-        )
-        fx = df_pl[df_pl['Category'] == 'FX Gain/Loss']['Amount'].sum()
-        
-        ebt = ebit - interest_net - fx
-        tax = df_pl[df_pl['Category'] == 'Tax Expense']['Amount'].sum()
-        net_income = ebt - tax
-        
-        # Add calculated rows
-        calculated = [
-            {'Category': 'Net Revenue', 'Amount': net_revenue, 'Order': 2.5},
-            {'Category': 'Gross Profit', 'Amount': gross_profit, 'Order': 3.5},
-            {'Category': 'Total OpEx', 'Amount': total_opex, 'Order': 9.5},
-            {'Category': 'EBITDA', 'Amount': ebitda, 'Order': 9.6},
-            {'Category': 'EBIT', 'Amount': ebit, 'Order': 9.7},
-            {'Category': 'EBT', 'Amount': ebt, 'Order': 12.5},
-            {'Category': 'Net Income', 'Amount': net_income, 'Order': 14},
+        Args:
+            account_column: Quoted account column or expression
+        
+        Returns:
+            SQL CASE expression yielding the category name
+        """
+        def literal(value):
+            return "'" + str(value).replace("'", "''") + "'"
+        
+        branches = [
+            f"WHEN {account_column} IN ({', '.join(literal(acc) for acc in config['accounts'])}) "
+            f"THEN {literal(category)}"
+            for category, config in cls.PL_STRUCTURE.items()
         ]
+        return 'CASE ' + ' '.join(branches) + ' END'
+    
+    @classmethod
+    def build_pl_summary(cls, category_totals: Dict[str, float]) -> pd.DataFrame:
+        """
+        Build the P&L summary from unsigned amount totals per category
+        
+        Shared by get_pl_summary and the database-side aggregation, so both
+        produce the same lines, derived metrics and margins.
         
-        df_pl = pd.concat([df_pl, pd.DataFrame(calculated)], ignore_index=True)
-        df_pl = df_pl.sort_values('Order').reset_index(drop=True)
+        Args:
+            category_totals: PL_STRUCTURE category -> summed amount as booked
+                (sign conventions are applied here); missing categories count as 0
+        
+        Returns:
+            DataFrame with P&L line items
+        """
+        categories = list(cls.PL_STRUCTURE)
+        position = {category: i for i, category in enumerate(categories)}
+        signs = np.array([config['sign'] for config in cls.PL_STRUCTURE.values()], dtype=np.float64)
+        amounts = np.array([category_totals.get(category, 0) for category in categories], dtype=np.float64) * signs
+        
+        def amount(category):
+            return amounts[position[category]] if category in position else 0.0
+        
+        # Calculate derived metrics
+        net_revenue = amount('Revenue') - amount('Contra Revenue')
+        gross_profit = net_revenue - amount('COGS')
+        total_opex = sum(amount(category) for category in cls.OPEX_CATEGORIES)
+        ebitda = gross_profit - (total_opex - amount('D&A'))
+        ebit = gross_profit - total_opex
+        interest_net = amount('Interest Expense') - amount('Interest Income')
+        ebt = ebit - interest_net - amount('FX Gain/Loss')
+        net_income = ebt - amount('Tax Expense')
+        derived = [net_revenue, gross_profit, total_opex, ebitda, ebit, ebt, net_income]
+        
+        # Interleave categories and derived lines by their order
+        names = np.array(categories + list(cls.PL_DERIVED), dtype=object)
+        orders = np.array([config['order'] for config in cls.PL_STRUCTURE.values()] + list(cls.PL_DERIVED.values()))
+        values = np.concatenate([amounts, derived])
+        row_order = np.argsort(orders, kind='stable')
+        values = values[row_order]
         
         # Add margins
         if net_revenue != 0:
-            df_pl['Margin %'] = (df_pl['Amount'] / net_revenue * 100).round(1)
+            margins = np.round(values / net_revenue * 100, 1)
         else:
-            df_pl['Margin %'] = 0
+            margins = np.zeros(len(values), dtype=np.int64)
         
-        return df_pl[['Category', 'Amount', 'Margin %']]
+        return pd.DataFrame({
+            'Category': names[row_order],
+            'Amount': values,
+            'Margin %': margins,
+        })
     
     def get_actual_vs_budget(
         self,
@@ -221,29 +680,15 @@ class ACDOCAAnalytics:
         if self.df_acdoca is None or self.df_budget is None:
             return pd.DataFrame()
         
-        df_act = self.df_acdoca.copy()
-        df_bud = self.df_budget.copy()
-        
-        # Apply filters
-        if company_codes:
-            df_act = df_act[df_act['RBUKRS'].isin(company_codes)]
-            df_bud = df_bud[df_bud['RBUKRS'].isin(company_codes)]
-        if year:
-            df_act = df_act[df_act['GJAHR'] == year]
-            df_bud = df_bud[df_bud['GJAHR'] == year]
-        if periods:
-            df_act = df_act[df_act['POPER'].isin(periods)]
-            df_bud = df_bud[df_bud['POPER'].isin(periods)]
-        
-        # Aggregate actuals by account
-        act_totals = df_act.groupby('RACCT')['KSL'].sum()
-        bud_totals = df_bud.groupby('RACCT')['KSL'].sum()
+        years = [year] if year else None
+        act_totals = self.get_pl_cube('USD').category_totals(company_codes, years, periods)
+        bud_totals = self.get_pl_cube('USD', source='budget').category_totals(company_codes, years, periods)
         
         # Build comparison by P&L category
         comparison = []
         for category, config in self.PL_STRUCTURE.items():
-            actual = sum(act_totals.get(acc, 0) * config['sign'] for acc in config['accounts'])
-            budget = sum(bud_totals.get(acc, 0) * config['sign'] for acc in config['accounts'])
+            actual = act_totals[category] * config['sign']
+            budget = bud_totals[category] * config['sign']
             variance = actual - budget
             variance_pct = (variance / budget * 100) if budget != 0 else 0
             
@@ -276,6 +721,9 @@ class ACDOCAAnalytics:
         """
         if self.df_acdoca is None:
             return pd.DataFrame()
+        if 'BELNR' not in self.df_acdoca.columns:
+            logger.warning("Cost center analysis needs line items; not available on aggregates")
+            return pd.DataFrame()
         
         df = self.df_acdoca.copy()
         
@@ -293,7 +741,7 @@ class ACDOCAAnalytics:
             df = df[df['POPER'].isin(periods)]
         
         # Aggregate by cost center
-        cc_totals = df.groupby('RCNTR').agg({
+        cc_totals = df.groupby('RCNTR', observed=True).agg({
             'KSL': 'sum',
             'BELNR': 'nunique',  # Document count
         }).reset_index()
@@ -327,27 +775,14 @@ class ACDOCAAnalytics:
         if self.df_acdoca is None:
             return pd.DataFrame()
         
-        df = self.df_acdoca.copy()
-        
-        # Apply filters
-        if company_codes:
-            df = df[df['RBUKRS'].isin(company_codes)]
-        if years:
-            df = df[df['GJAHR'].isin(years)]
-        
         # Get accounts for the metric
         config = self.PL_STRUCTURE.get(metric)
         if not config:
             return pd.DataFrame()
         
-        df = df[df['RACCT'].isin(config['accounts'])]
-        
-        # Aggregate by year/month
-        monthly = df.groupby(['GJAHR', 'POPER'])['KSL'].sum().reset_index()
-        monthly['Amount'] = monthly['KSL'] * config['sign']
-        monthly['Period'] = monthly.apply(
-            lambda x: f"{int(x['GJAHR'])}-{int(x['POPER']):02d}", axis=1
-        )
+        monthly = self.get_pl_cube('USD').monthly(metric, company_codes, years)
+        monthly['Amount'] = monthly['Amount'] * config['sign']
+        monthly['Period'] = [f"{int(y)}-{int(p):02d}" for y, p in zip(monthly['GJAHR'], monthly['POPER'])]
         
         return monthly[['Period', 'GJAHR', 'POPER', 'Amount']]
     
@@ -400,9 +835,10 @@ class ACDOCAAnalytics:
         if pl.empty:
             return {}
         
+        amounts = dict(zip(pl['Category'], pl['Amount']))
+        
         def get_amount(category):
-            row = pl[pl['Category'] == category]
-            return row['Amount'].iloc[0] if not row.empty else 0
+            return amounts.get(category, 0)
         
         revenue = get_amount('Net Revenue')
         gross_profit = get_amount('Gross Profit')
@@ -423,7 +859,51 @@ class ACDOCAAnalytics:
         }
 
 
+def _as_frame(data):
+    """Unwrap a CompactAcdocaFrame to its DataFrame"""
+    return data.frame if isinstance(data, CompactAcdocaFrame) else data
+
+
 # Convenience function for quick analysis
 def analyze_acdoca(df_acdoca: pd.DataFrame, df_budget: pd.DataFrame = None) -> ACDOCAAnalytics:
     """Create an analytics instance with data loaded"""
     return ACDOCAAnalytics(df_acdoca, df_budget)
+
+
+def aggregate_acdoca_chunks(
+    chunks,
+    by: Tuple[str, ...] = ('RBUKRS', 'GJAHR', 'POPER', 'RACCT', 'RCNTR'),
+    values: Tuple[str, ...] = ('HSL', 'KSL'),
+) -> pd.DataFrame:
+    """
+    Reduce streamed ACDOCA chunks to summed amounts per key
+
+    Each chunk is aggregated as it arrives and folded into running totals,
+    so memory is bounded by the number of distinct keys rather than the
+    number of journal lines. With the default keys the result can replace
+    line items in ACDOCAAnalytics for the P&L, budget, trend, YoY and KPI
+    methods (cost center document counts still need line items).
+
+    Args:
+        chunks: Iterable of ACDOCA DataFrames, e.g. FinancialDataService.iter_acdoca_data()
+        by: Grouping columns
+        values: Amount columns to sum
+
+    Returns:
+        DataFrame with the grouping columns and summed amounts
+    """
+    by, values = list(by), list(values)
+    totals = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        partial = chunk.groupby(by, dropna=False, sort=False, observed=True)[values].sum()
+        if totals is not None:
+            partial = pd.concat([totals, partial]).groupby(
+                level=by, dropna=False, sort=False, observed=True
+            ).sum()
+        totals = partial
+
+    if totals is None:
+        return pd.DataFrame(columns=by + values)
+    return totals.reset_index()
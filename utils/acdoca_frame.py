@@ -0,0 +1,233 @@
+"""
+Compact in-memory representation of ACDOCA journal lines
+
+Dimension columns are dictionary-encoded as categoricals, amounts kept as
+float64, dates stored as int32 day numbers and the free-text columns kept
+out of the frame until they are asked for.
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Dimension columns stored as categoricals (document numbers such as BELNR are
+# nearly unique per document and stay plain columns)
+DIMENSION_COLUMNS = ('RBUKRS', 'RACCT', 'RCNTR', 'PRCTR', 'SEGMENT', 'BLART',
+                     'DRCRK', 'RHCUR', 'RKCUR')
+
+# Integer columns and their compact dtype
+INTEGER_COLUMNS = {'GJAHR': np.int16, 'POPER': np.int8, 'DOCLN': np.int32, 'ID': np.int64}
+
+AMOUNT_COLUMNS = ('HSL', 'KSL', 'TSL')
+
+DATE_COLUMNS = ('BUDAT', 'BLDAT', 'CPUDT')
+
+TEXT_COLUMNS = ('SGTXT', 'BKTXT')
+
+# Day number stored for a missing date
+NULL_DAY = np.iinfo(np.int32).min
+
+
+class AcdocaDictionaries:
+    """
+    Category dictionaries shared by compact ACDOCA frames.
+
+    Seeded from master data (GL_ACCOUNTS, COST_CENTERS, COMPANY_CODES) and
+    extended with values first seen in the journal lines. New values are
+    only ever appended, so the codes of frames encoded earlier stay valid
+    and frames built from consecutive chunks concatenate without decoding.
+    """
+
+    def __init__(self, values: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            values: Column -> known values (e.g. FinancialDataService.get_acdoca_dictionaries())
+        """
+        self._lock = threading.Lock()
+        self._categories = {column: list(dict.fromkeys(v for v in known if v is not None))
+                            for column, known in (values or {}).items()}
+        self._known = {column: set(categories) for column, categories in self._categories.items()}
+        self._dtypes = {}
+
+    def encode(self, column: str, data: pd.Series) -> pd.Series:
+        """
+        Encode values as a categorical over the column's dictionary
+
+        The values are factorized once; only their distinct values are looked
+        up in (and, when unseen, appended to) the dictionary.
+
+        Args:
+            column: Dimension column name
+            data: Values to encode
+
+        Returns:
+            Categorical Series aligned with data
+        """
+        codes, uniques = pd.factorize(data)
+        with self._lock:
+            categories = self._categories.setdefault(column, [])
+            known = self._known.setdefault(column, set())
+            unseen = [v for v in uniques if v not in known]
+            if unseen or column not in self._dtypes:
+                unseen.sort()
+                categories.extend(unseen)
+                known.update(unseen)
+                self._dtypes[column] = pd.CategoricalDtype(categories)
+            dtype = self._dtypes[column]
+
+        # Trailing -1 is what factorize's missing-value code (-1) indexes
+        lookup = np.append(dtype.categories.get_indexer(uniques), -1)
+        return pd.Series(pd.Categorical.from_codes(lookup[codes], dtype=dtype),
+                         index=data.index, name=data.name)
+
+
+class CompactAcdocaFrame:
+    """
+    ACDOCA journal lines in a compact column layout.
+
+    `frame` holds the dimension, integer, amount and date columns and can be
+    given to ACDOCAAnalytics directly. Text columns are loaded on first call
+    to texts() through the loader (by ID), or kept aside when the source
+    frame already had them.
+    """
+
+    def __init__(self, frame: pd.DataFrame, text_loader: Optional[Callable] = None,
+                 texts: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            frame: Compact columns (see from_frame)
+            text_loader: Callable taking a list of IDs and returning a DataFrame
+                of the text columns indexed by ID
+            texts: Text columns already available, aligned with frame
+        """
+        self.frame = frame
+        self.text_loader = text_loader
+        self._texts = texts
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dictionaries: Optional[AcdocaDictionaries] = None,
+                   text_loader: Optional[Callable] = None) -> 'CompactAcdocaFrame':
+        """
+        Encode an ACDOCA DataFrame (e.g. a get_acdoca_data result or stream chunk)
+
+        Args:
+            df: Journal lines
+            dictionaries: Shared dictionaries; a private set is used when omitted
+            text_loader: Loader for the text columns when df does not have them
+
+        Returns:
+            CompactAcdocaFrame
+        """
+        dictionaries = dictionaries or AcdocaDictionaries()
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if column in TEXT_COLUMNS:
+                continue
+            if column in DIMENSION_COLUMNS:
+                columns[column] = dictionaries.encode(column, series)
+            elif column in INTEGER_COLUMNS and not series.isna().any():
+                columns[column] = series.astype(INTEGER_COLUMNS[column])
+            elif column in AMOUNT_COLUMNS:
+                columns[column] = pd.to_numeric(series).astype(np.float64)
+            elif column in DATE_COLUMNS:
+                columns[column] = to_day_numbers(series)
+            else:
+                columns[column] = series
+
+        texts = None
+        present = [column for column in TEXT_COLUMNS if column in df.columns]
+        if present:
+            texts = df[present].reset_index(drop=True)
+
+        frame = pd.DataFrame(columns, copy=False).reset_index(drop=True)
+        return cls(frame, text_loader=None if texts is not None else text_loader, texts=texts)
+
+    @classmethod
+    def concat(cls, parts: List['CompactAcdocaFrame']) -> 'CompactAcdocaFrame':
+        """
+        Concatenate frames encoded with the same dictionaries
+
+        Parts are widened to the longest categories of each column (the
+        dictionaries only append, so that keeps their codes), so the result
+        stays categorical.
+        """
+        if not parts:
+            return cls(pd.DataFrame())
+
+        frames = [part.frame for part in parts]
+        for column in frames[-1].columns:
+            dtypes = [frame[column].dtype for frame in frames if column in frame.columns]
+            if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+                dtype = max(dtypes, key=lambda candidate: len(candidate.categories))
+                frames = [
+                    frame.assign(**{column: frame[column].cat.set_categories(dtype.categories)})
+                    if column in frame.columns and frame[column].dtype != dtype else frame
+                    for frame in frames
+                ]
+
+        texts = None
+        if all(part._texts is not None for part in parts):
+            texts = pd.concat([part._texts for part in parts], ignore_index=True)
+
+        return cls(pd.concat(frames, ignore_index=True), text_loader=parts[-1].text_loader, texts=texts)
+
+    def texts(self) -> pd.DataFrame:
+        """
+        Get the text columns aligned with frame, loading them on first use
+
+        Returns:
+            DataFrame with SGTXT and BKTXT (empty when they cannot be loaded)
+        """
+        if self._texts is None:
+            if self.text_loader is None or 'ID' not in self.frame.columns:
+                return pd.DataFrame(index=self.frame.index, columns=list(TEXT_COLUMNS))
+            loaded = self.text_loader(self.frame['ID'].tolist())
+            self._texts = loaded.reindex(self.frame['ID'].to_numpy()).reset_index(drop=True)
+        return self._texts
+
+    def dates(self, column: str = 'BUDAT') -> pd.Series:
+        """Decode a day-number column back to datetime64"""
+        return from_day_numbers(self.frame[column])
+
+    def to_frame(self, include_texts: bool = False) -> pd.DataFrame:
+        """
+        Decode to a plain DataFrame (string dimensions, datetime dates)
+
+        Args:
+            include_texts: Also load and add the text columns
+        """
+        df = self.frame.copy()
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(object)
+            elif column in DATE_COLUMNS:
+                df[column] = from_day_numbers(df[column])
+        if include_texts:
+            df = pd.concat([df, self.texts()], axis=1)
+        return df
+
+    def memory_usage(self) -> int:
+        """Bytes held by the compact columns (texts excluded)"""
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def __len__(self):
+        return len(self.frame)
+
+
+def to_day_numbers(series: pd.Series) -> pd.Series:
+    """Convert dates to int32 days since 1970-01-01 (NULL_DAY for missing dates)"""
+    values = pd.to_datetime(series, cache=False).to_numpy().astype('datetime64[D]')
+    days = values.astype(np.int64)
+    days[np.isnat(values)] = NULL_DAY
+    return pd.Series(days.astype(np.int32), index=series.index, name=series.name)
+
+
+def from_day_numbers(series: pd.Series) -> pd.Series:
+    """Convert int32 day numbers back to datetime64 (NaT for NULL_DAY)"""
+    days = series.to_numpy()
+    values = days.astype('datetime64[D]')
+    values[days == NULL_DAY] = np.datetime64('NaT')
+    return pd.Series(values.astype('datetime64[s]'), index=series.index, name=series.name)
@@ -65,7 +65,29 @@ def load_config():
             'user': os.getenv('HANA_USER'),
             'password': os.getenv('HANA_PASSWORD'),
             'schema': os.getenv('HANA_SCHEMA', 'BLOOMBERG_DATA'),
-            'table': os.getenv('HANA_TABLE', 'FINANCIAL_RATIOS')
+            'table': os.getenv('HANA_TABLE', 'FINANCIAL_RATIOS'),
+            'insert_batch_size': int(os.getenv('HANA_INSERT_BATCH_SIZE', '1000')),
+            'pool_min_size': int(os.getenv('HANA_POOL_MIN_SIZE', '1')),
+            'pool_max_size': int(os.getenv('HANA_POOL_MAX_SIZE', '5')),
+            'ingest_max_workers': int(os.getenv('HANA_INGEST_MAX_WORKERS', '3')),
+            'statement_cache_size': int(os.getenv('HANA_STATEMENT_CACHE_SIZE', '32'))
+        },
+
+        # Dashboard query result cache (per worker process)
+        'cache': {
+            'max_entries': int(os.getenv('CACHE_MAX_ENTRIES', '256')),
+            'max_mb': int(os.getenv('CACHE_MAX_MB', '64')),
+            'default_ttl': int(os.getenv('CACHE_DEFAULT_TTL', '60')),
+            'use_watermark': os.getenv('CACHE_USE_WATERMARK', 'true').lower() == 'true',
+            'watermark_interval': int(os.getenv('CACHE_WATERMARK_INTERVAL', '5')),
+            'max_age': int(os.getenv('CACHE_MAX_AGE', '3600')),
+            'max_stale': int(os.getenv('CACHE_MAX_STALE', '300')),
+            'refresh_ahead': float(os.getenv('CACHE_REFRESH_AHEAD', '0.2')),
+            'hot_threshold': int(os.getenv('CACHE_HOT_THRESHOLD', '3')),
+            # Cross-worker store ('file' or empty to disable)
+            'shared_backend': os.getenv('CACHE_SHARED_BACKEND', ''),
+            'shared_dir': os.getenv('CACHE_SHARED_DIR', ''),
+            'shared_max_mb': int(os.getenv('CACHE_SHARED_MAX_MB', '256'))
         }
     }
 